@@ -0,0 +1,82 @@
+""" measure memory per row and update cost of Lines with and without compact storage
+
+    rows are set to one of a few states or to unique text, memory is measured with
+    tracemalloc after every row is set and after random updates of rows, it
+    includes the data and the update time of every row
+
+        python benchmarks/compact.py --rows 1000000 --updates 200000
+"""
+import io
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from list2term import Lines
+
+STATES = ['pending', 'downloading', 'verifying', 'complete', 'failed']
+
+
+class NullStream(io.TextIOBase):
+    """ stream that is not a terminal and discards everything written to it
+    """
+
+    def write(self, text):
+        return len(text)
+
+
+def get_value(kind, number):
+    """ return value of row number
+    """
+    if kind == 'states':
+        return STATES[number % len(STATES)]
+    return f'item {number} processed {number * 7 % 1000} records'
+
+
+def update(lines, indices, kind):
+    """ update lines at indices
+    """
+    for count, index in enumerate(indices):
+        lines[index] = get_value(kind, count)
+
+
+def run(rows, updates, kind, compact):
+    """ return bytes per row after the rows are set and after they are updated
+        and seconds per update
+    """
+    indices = [random.randrange(rows) for _ in range(updates)]
+    tracemalloc.start()
+    lines = Lines(size=rows, compact=compact, show_index=False)
+    update(lines, range(rows), kind)
+    filled = tracemalloc.get_traced_memory()[0]
+    update(lines, indices, kind)
+    updated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    update(lines, indices, kind)
+    elapsed = time.perf_counter() - start
+    return filled / rows, updated / rows, elapsed / updates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='measure memory per row and update cost of compact storage')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='number of rows')
+    parser.add_argument('--updates', type=int, default=200_000, help='number of updates timed')
+    args = parser.parse_args(argv)
+    print(f'python {sys.version.split()[0]} rows: {args.rows:,}')
+    print(f'{"values":>8} {"storage":>8} {"bytes/row":>10} {"updated":>10} {"update us":>10}')
+    # more lines than the terminal height can only be tracked when stderr is not a terminal
+    stderr = sys.stderr
+    sys.stderr = NullStream()
+    try:
+        for kind in ('states', 'unique'):
+            for compact in (False, True):
+                filled, updated, per_update = run(args.rows, args.updates, kind, compact)
+                storage = 'compact' if compact else 'list'
+                print(f'{kind:>8} {storage:>8} {filled:>10.1f} {updated:>10.1f} {per_update * 1e6:>10.2f}')
+    finally:
+        sys.stderr = stderr
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+""" measure Lines update throughput by number of writer threads
+
+    each thread updates its own lines in three modes:
+        locked: lines are set under the Lines lock and every update is printed
+        unprinted: lines are set under the Lines lock and nothing is printed, as when
+            stderr is not a terminal, this isolates the cost of the lock
+        sharded: updates are stored in shards that the render clock applies once per
+            frame printing the latest update of each line
+    sharded versus unprinted measures contention, locked versus sharded also includes
+    the updates that are never printed because a later update of the line replaced them
+    run on a regular and on a free-threaded (3.13t) interpreter to compare
+
+        python benchmarks/concurrency.py --updates 200000 --threads 1 2 4 8
+"""
+import io
+import sys
+import time
+import argparse
+import threading
+import sysconfig
+import list2term.list2term
+from list2term import Lines
+
+
+class NullStream(io.TextIOBase):
+    """ stream that is not a terminal and discards everything written to it
+    """
+
+    def write(self, text):
+        return len(text)
+
+
+class NullTTY(NullStream):
+    """ terminal that discards everything written to it
+    """
+
+    def isatty(self):
+        return True
+
+
+class NullCursor:
+    """ cursor whose visibility is never changed so the terminal is left alone
+    """
+
+    @staticmethod
+    def hide():
+        pass
+
+    @staticmethod
+    def show():
+        pass
+
+
+def run(threads, updates, rows, shards):
+    """ return updates per second of threads updating distinct lines
+    """
+    per_thread = updates // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def update(lines, number):
+        indices = range(number, rows, threads)
+        barrier.wait()
+        for count in range(per_thread):
+            lines[indices[count % len(indices)]] = count
+
+    lines = Lines(size=rows, shards=shards)
+    with lines:
+        workers = [threading.Thread(target=update, args=(lines, number)) for number in range(threads)]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+    return per_thread * threads / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='measure Lines update throughput by number of threads')
+    parser.add_argument('--updates', type=int, default=200_000, help='total number of updates')
+    parser.add_argument('--rows', type=int, default=64, help='number of lines')
+    parser.add_argument('--shards', type=int, default=16, help='number of shards of the sharded mode')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8], help='numbers of threads')
+    args = parser.parse_args(argv)
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    free_threaded = bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+    print(f'python {sys.version.split()[0]} free-threaded build: {free_threaded} gil enabled: {gil}')
+    print(f'{"threads":>8} {"locked/s":>12} {"unprinted/s":>12} {"sharded/s":>12}')
+    modes = ((NullTTY, None), (NullStream, None), (NullTTY, args.shards))
+    stderr = sys.stderr
+    cursor = list2term.list2term.cursor
+    # NullTTY makes Lines hide and show the cursor of the real terminal
+    list2term.list2term.cursor = NullCursor
+    try:
+        for threads in args.threads:
+            rates = []
+            for stream, shards in modes:
+                sys.stderr = stream()
+                rates.append(run(threads, args.updates, args.rows, shards))
+            print(f'{threads:>8}' + ''.join(f' {rate:>12,.0f}' for rate in rates))
+    finally:
+        sys.stderr = stderr
+        list2term.list2term.cursor = cursor
+
+
+if __name__ == '__main__':
+    main()
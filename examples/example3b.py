@@ -0,0 +1,27 @@
+import asyncio
+import random
+from faker import Faker
+from list2term import Lines
+from list2term.asyncio import async_map
+
+async def do_work(item, logger):
+    total = random.randint(2, 10)
+    for _ in range(total):
+        # mimic an IO-bound process
+        await asyncio.sleep(random.choice([.05, .1, .025]))
+        logger.write(f'item {item} processed {Faker().name()}')
+    return total
+
+async def run(items, concurrency):
+    with Lines(size=concurrency) as lines:
+        return await async_map(do_work, range(items), concurrency=concurrency, lines=lines)
+
+def main():
+    items = 500
+    concurrency = 15
+    print(f'Total of {items} items processed by {concurrency} concurrent tasks')
+    results = asyncio.run(run(items, concurrency))
+    print(f'The {items} items processed a total of {sum(results)} names')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import time
+from list2term import Lines
+from list2term.cells import Spinner
+from list2term.cells import Elapsed
+from list2term.multiprocessing import pool_map
+from list2term.multiprocessing import CONCURRENCY
+
+def is_prime(num):
+    if num == 1:
+        return False
+    for i in range(2, num):
+        if (num % i) == 0:
+            return False
+    else:
+        return True
+
+def count_primes(start, stop, logger):
+    worker_id = f'{start}:{stop}'
+    # a single message when the state changes, the renderer animates the line
+    logger.write(f'{worker_id}->{worker_id} counting primes')
+    primes = sum(1 for number in range(start, stop) if is_prime(number))
+    logger.write(f'{worker_id}->{worker_id} found {primes} primes')
+    return primes
+
+def animate(message):
+    return Spinner(message) if message.endswith('counting primes') else Elapsed(message)
+
+def main(number):
+    step = int(number / CONCURRENCY)
+    iterable = [(index, index + step) for index in range(0, number, step)]
+    lookup = [':'.join(map(str, item)) for item in iterable]
+    results = pool_map(count_primes, iterable, context=Lines(lookup=lookup, animate=animate))
+    return sum(results.get())
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    number = 100_000
+    result = main(number)
+    stop = time.perf_counter()
+    print(f"Finished in {round(stop - start, 2)} seconds\nTotal number of primes between 0-{number}: {result}")
@@ -0,0 +1,17 @@
+import time
+import random
+from faker import Faker
+from list2term.threading import thread_map
+from list2term.threading import report
+
+def process_item(item):
+    report(f'{Faker().name()} processed item {item}')
+    seconds = random.uniform(.04, .3)
+    time.sleep(seconds)
+    return seconds
+
+def main():
+    return list(thread_map(process_item, range(250), max_workers=10))
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,15 @@
 from importlib import metadata as _metadata
 import os as _os
 
-__all__ = ['Lines', '__version__']
+__all__ = ['Lines', 'LinesHandler', '__version__']
 
 def __getattr__(name: str):
     if name == "Lines":
         from .list2term import Lines
         return Lines
+    if name == "LinesHandler":
+        from .list2term import LinesHandler
+        return LinesHandler
     raise AttributeError(name)
 
 try:
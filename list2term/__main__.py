@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import selectors
+from list2term import Lines
+from list2term.list2term import FRAME_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1 << 16
+SEPARATOR = b'->'
+
+
+class StreamReader:
+    """ read "{line_id}->{message}" lines from a file descriptor in large chunks
+        keeping only the latest message for each line id until taken
+    """
+
+    def __init__(self, fd, pending, above, is_stdin=False):
+        """ constructor
+        """
+        self.fd = fd
+        self._is_stdin = is_stdin
+        self._pending = pending
+        self._above = above
+        self._partial = b''
+
+    def read(self):
+        """ read available chunk and return False on end of file
+        """
+        try:
+            chunk = os.read(self.fd, CHUNK_SIZE)
+        except BlockingIOError:
+            return True
+        if not chunk:
+            if self._partial:
+                self._parse([self._partial])
+                self._partial = b''
+            return False
+        parts = (self._partial + chunk).split(b'\n')
+        self._partial = parts.pop()
+        self._parse(parts)
+        return True
+
+    def close(self):
+        """ close file descriptor restoring stdin to blocking
+        """
+        if self._is_stdin:
+            os.set_blocking(self.fd, True)
+        else:
+            os.close(self.fd)
+
+    def _parse(self, parts):
+        """ store latest message of each line id, lines without an id are printed above
+        """
+        pending = self._pending
+        for part in parts:
+            # lines written on windows end with \r\n
+            part = part.rstrip(b'\r')
+            line_id, separator, message = part.rpartition(SEPARATOR)
+            if separator:
+                pending[line_id.strip()] = message
+            elif part.strip():
+                self._above.append(part)
+
+
+def _open(source):
+    """ return non blocking file descriptor for source, - is stdin
+    """
+    if source == '-':
+        fd = sys.stdin.fileno()
+        os.set_blocking(fd, False)
+        return fd
+    return os.open(source, os.O_RDONLY | os.O_NONBLOCK)
+
+
+def _get_max_lines():
+    """ return number of lines that fit the terminal or None when stderr is not a terminal
+    """
+    if not sys.stderr.isatty():
+        return None
+    try:
+        # the cursor rests on the row below the lines
+        return max(os.get_terminal_size().lines - 1, 1)
+    except OSError:
+        return None
+
+
+def _render(lines, pending, above, max_lines=None):
+    """ apply coalesced messages to lines creating lines for new ids
+        messages for new ids are printed above the lines once max_lines lines exist
+    """
+    for text in above:
+        lines.print_above(text.decode('utf-8', errors='replace'))
+    above.clear()
+    for line_id, message in pending.items():
+        message = message.decode('utf-8', errors='replace').lstrip()
+        line_id = line_id.decode('utf-8', errors='replace')
+        index = lines.index_of(line_id)
+        if index is None:
+            if max_lines is None or len(lines) < max_lines:
+                lines.add_line(line_id, message)
+            else:
+                lines.print_above(f'{line_id}->{message}')
+        elif lines[index] != message:
+            lines[index] = message
+    pending.clear()
+
+
+def run(sources, lines, interval=FRAME_INTERVAL, max_lines=None):
+    """ render messages read from sources to lines at most once every interval seconds
+        at most max_lines lines are created, messages for further ids are printed above
+    """
+    pending = {}
+    above = []
+    selector = selectors.DefaultSelector()
+    # readers not yet closed, closing them restores stdin to blocking
+    readers = []
+    # regular files can not be registered with epoll and are always readable
+    files = []
+    try:
+        for source in sources:
+            reader = StreamReader(_open(source), pending, above, is_stdin=source == '-')
+            readers.append(reader)
+            try:
+                selector.register(reader.fd, selectors.EVENT_READ, reader)
+            except (PermissionError, ValueError):
+                files.append(reader)
+        next_frame = time.monotonic()
+        with lines:
+            while selector.get_map() or files:
+                timeout = 0 if files else max(next_frame - time.monotonic(), 0)
+                for key, _ in selector.select(timeout):
+                    if not key.data.read():
+                        selector.unregister(key.fd)
+                        readers.remove(key.data)
+                        key.data.close()
+                for reader in list(files):
+                    if not reader.read():
+                        files.remove(reader)
+                        readers.remove(reader)
+                        reader.close()
+                if time.monotonic() >= next_frame:
+                    _render(lines, pending, above, max_lines=max_lines)
+                    next_frame = time.monotonic() + interval
+            _render(lines, pending, above, max_lines=max_lines)
+    finally:
+        for reader in readers:
+            reader.close()
+        selector.close()
+
+
+def get_parser():
+    """ return argument parser
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m list2term',
+        description='display "{line_id}->{message}" lines read from stdin, files or named pipes')
+    parser.add_argument('sources', nargs='*', default=['-'], help='files or named pipes to read, - is stdin (default)')
+    parser.add_argument('--interval', type=float, default=FRAME_INTERVAL, help='seconds between frames')
+    parser.add_argument('--max-chars', type=int, default=None, help='maximum characters per line')
+    parser.add_argument('--no-index', action='store_true', help='do not show line ids')
+    parser.add_argument('--no-color', action='store_true', help='do not color line ids')
+    parser.add_argument('--max-lines', type=int, default=None,
+                        help='maximum number of lines, further ids are printed above the lines '
+                             '(default: terminal height)')
+    return parser
+
+
+def main(argv=None):  # pragma: no cover
+    """ main entry point
+    """
+    args = get_parser().parse_args(argv)
+    lines = Lines(data=[], lookup=[], y_axis_labels=[], show_index=not args.no_index,
+                  max_chars=args.max_chars, use_color=not args.no_color)
+    try:
+        run(args.sources, lines, interval=args.interval, max_lines=args.max_lines or _get_max_lines())
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import sys
+import asyncio
+import logging
+import functools
+
+logger = logging.getLogger(__name__)
+
+
+class LineWriter:
+    """ writes messages from a task to the line assigned to it
+    """
+    __slots__ = ('_lines', '_index', '_print_status')
+
+    def __init__(self, lines, index, print_status=True):
+        """ constructor
+        """
+        self._lines = lines
+        self._index = index
+        self._print_status = print_status
+
+    def write(self, item):
+        """ update the line assigned to the task with item
+        """
+        if self._lines is not None:
+            if self._lines[self._index] != item:
+                self._lines[self._index] = item
+        elif self._print_status:
+            print(item, file=sys.stderr)
+
+
+async def async_map(function, iterable, concurrency=10, lines=None, print_status=True,
+                    blocking=False, executor=None):
+    """ asyncio helper function to run function for each item in iterable with at most
+        concurrency tasks running and write their messages to lines
+        items are a tuple of arguments or a single argument, the function is passed a
+        LineWriter as its last argument that writes to the line assigned to the task
+        lines must have at least concurrency lines, lines are recycled as tasks finish
+        blocking runs function in executor (default executor when None) instead of awaiting it
+        returns list of results in the order of iterable
+    """
+    if concurrency <= 0:
+        raise ValueError('concurrency must be greater than 0')
+    if lines is not None and len(lines) < concurrency:
+        raise ValueError('size of lines must be greater than or equal to concurrency')
+    loop = asyncio.get_running_loop()
+    free = list(reversed(range(concurrency)))
+    results = {}
+    tasks = set()
+
+    async def run(position, args, index):
+        writer = LineWriter(lines, index, print_status=print_status)
+        try:
+            if blocking:
+                call = functools.partial(function, *args, writer)
+                results[position] = await loop.run_in_executor(executor, call)
+            else:
+                results[position] = await function(*args, writer)
+        finally:
+            free.append(index)
+
+    async def wait_for_slot():
+        nonlocal tasks
+        done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            # raise the first exception raised by a task
+            task.result()
+
+    try:
+        count = 0
+        for position, item in enumerate(iterable):
+            while not free:
+                await wait_for_slot()
+            args = item if isinstance(item, tuple) else (item,)
+            tasks.add(asyncio.ensure_future(run(position, args, free.pop())))
+            count += 1
+        while tasks:
+            await wait_for_slot()
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return [results[position] for position in range(count)]
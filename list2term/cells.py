@@ -0,0 +1,68 @@
+import time
+from datetime import timedelta
+
+SPINNER_FRAMES = '|/-\\'
+SPINNER_INTERVAL = .1
+
+
+class Cell:
+    """ value of a line that is animated by the render clock
+        render is called with the current monotonic time every frame and returns the
+        text displayed, the line is reprinted only when the text changes
+        cells of the same type with the same text are equal so writing the same
+        message again does not restart the animation
+    """
+
+    def __init__(self, text=''):
+        """ constructor
+        """
+        self.text = text
+        self.start = time.monotonic()
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.text == self.text
+
+    __hash__ = None
+
+    def __str__(self):
+        return self.render(time.monotonic())
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.text!r})'
+
+    def render(self, now):
+        """ return text displayed at monotonic time now
+        """
+        raise NotImplementedError
+
+
+class Spinner(Cell):
+    """ text preceded by a spinner advancing one frame every interval seconds
+    """
+
+    def __init__(self, text='', frames=SPINNER_FRAMES, interval=SPINNER_INTERVAL):
+        """ constructor
+        """
+        super().__init__(text)
+        self.frames = frames
+        self.interval = interval
+
+    def render(self, now):
+        frame = self.frames[int((now - self.start) / self.interval) % len(self.frames)]
+        return f'{frame} {self.text}'
+
+
+class Elapsed(Cell):
+    """ text followed by the time elapsed since the cell was created
+    """
+
+    def render(self, now):
+        return f'{self.text} {timedelta(seconds=int(now - self.start))}'
+
+
+class Updated(Cell):
+    """ text followed by how long ago the cell was created
+    """
+
+    def render(self, now):
+        return f'{self.text} (updated {int(now - self.start)}s ago)'
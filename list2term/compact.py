@@ -0,0 +1,154 @@
+from array import array
+from collections.abc import MutableSequence
+
+RECENT_TEXTS = 256
+COMPACT_SIZE = 1 << 20
+
+
+def to_text(item):
+    """ return text of item, list/tuple parts are joined and None is empty
+    """
+    if item is None:
+        return ''
+    if isinstance(item, str):
+        return item
+    if isinstance(item, (list, tuple)):
+        # join parts safely (preserves ANSI sequences if present)
+        return ''.join('' if part is None else str(part) for part in item)
+    return str(item)
+
+
+class CompactRows(MutableSequence):
+    """ sequence of rows stored as utf-8 encoded text in a single byte arena
+        each row is the offset and length of its text in arrays of 4 byte integers,
+        rows set to one of the recently stored texts share its bytes so rows set to
+        a few states cost 8 bytes each
+        text replaced by an update is garbage until the arena is compacted, which
+        happens when the arena doubled in size since it was last compacted
+        items are converted to text when they are set
+    """
+
+    __slots__ = ('_offsets', '_lengths', '_arena', '_recent', '_recent_texts', '_compacted')
+
+    def __init__(self, items=(), recent_texts=RECENT_TEXTS):
+        """ constructor
+        """
+        self._offsets = array('I')
+        self._lengths = array('I')
+        self._arena = bytearray()
+        # text to offset and length of recently stored texts, oldest first
+        self._recent = {}
+        self._recent_texts = recent_texts
+        self._compacted = 0
+        self.extend(items)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __eq__(self, other):
+        if isinstance(other, (CompactRows, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(offset, length) for offset, length in zip(self._offsets[index], self._lengths[index])]
+        return self._get(self._offsets[index], self._lengths[index])
+
+    def __setitem__(self, index, item):
+        if isinstance(index, slice):
+            offsets = array('I')
+            lengths = array('I')
+            for value in item:
+                offset, length = self._store(to_text(value))
+                offsets.append(offset)
+                lengths.append(length)
+            self._offsets[index] = offsets
+            self._lengths[index] = lengths
+        else:
+            offset, length = self._store(to_text(item))
+            self._offsets[index] = offset
+            self._lengths[index] = length
+        self._compact_if_needed()
+
+    def __delitem__(self, index):
+        del self._offsets[index]
+        del self._lengths[index]
+
+    def insert(self, index, item):
+        offset, length = self._store(to_text(item))
+        self._offsets.insert(index, offset)
+        self._lengths.insert(index, length)
+        self._compact_if_needed()
+
+    def append(self, item):
+        offset, length = self._store(to_text(item))
+        self._offsets.append(offset)
+        self._lengths.append(length)
+        self._compact_if_needed()
+
+    def clear(self):
+        self._offsets = array('I')
+        self._lengths = array('I')
+        self._arena = bytearray()
+        self._recent.clear()
+        self._compacted = 0
+
+    def arena_size(self):
+        """ return size in bytes of the arena including garbage
+        """
+        return len(self._arena)
+
+    def _get(self, offset, length):
+        """ return text stored at offset
+        """
+        return self._arena[offset:offset + length].decode('utf-8')
+
+    def _store(self, text):
+        """ return offset and length of text reusing a recently stored text
+        """
+        stored = self._recent.get(text)
+        if stored is not None:
+            return stored
+        encoded = text.encode('utf-8', errors='replace')
+        stored = (len(self._arena), len(encoded))
+        self._arena += encoded
+        if len(self._recent) >= self._recent_texts:
+            del self._recent[next(iter(self._recent))]
+        self._recent[text] = stored
+        return stored
+
+    def _compact_if_needed(self):
+        """ compact arena when it doubled in size since it was last compacted
+        """
+        if len(self._arena) > 2 * self._compacted + COMPACT_SIZE:
+            self._compact()
+
+    def _compact(self):
+        """ copy text of every row to a new arena discarding garbage
+            rows sharing a recently stored text keep sharing it
+        """
+        arena = bytearray()
+        old = self._arena
+        offsets = self._offsets
+        moved = {stored: None for stored in self._recent.values()}
+        for row, stored in enumerate(zip(offsets, self._lengths)):
+            offset, length = stored
+            if stored in moved:
+                if moved[stored] is None:
+                    moved[stored] = len(arena)
+                    arena += old[offset:offset + length]
+                offsets[row] = moved[stored]
+            else:
+                offsets[row] = len(arena)
+                arena += old[offset:offset + length]
+        self._recent = {
+            text: (moved[stored], stored[1])
+            for text, stored in self._recent.items()
+            if moved[stored] is not None
+        }
+        self._arena = arena
+        self._compacted = len(arena)
@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+
+logger = logging.getLogger(__name__)
+
+MAX_SIZE = 10_000
+BATCH_SIZE = 512
+FLUSH_INTERVAL = .5
+
+
+class JsonlExporter:
+    """ export Lines updates as json lines written by a background thread
+        target is a file path or a writable text stream
+        updates are queued without blocking, updates are dropped and counted
+        when more than maxsize updates are pending
+    """
+
+    def __init__(self, target, maxsize=MAX_SIZE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        """ constructor
+        """
+        logger.debug('executing JsonlExporter constructor')
+        if isinstance(target, (str, os.PathLike)):
+            self._stream = open(target, 'w', encoding='utf-8')
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='lines-exporter', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def record(self, op, index=None, key=None, value=None):
+        """ queue an update for export without blocking
+        """
+        try:
+            self._queue.put_nowait({'ts': time.time(), 'op': op, 'index': index, 'key': key, 'value': value})
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """ write pending updates and stop the background thread
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        if self._owns_stream:
+            self._stream.close()
+        if self.dropped:
+            logger.warning('%s updates were dropped from export', self.dropped)
+
+    def _run(self):
+        """ write queued updates in batches until closed
+        """
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self._flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [record for record in batch if record is not None]
+            if batch:
+                self._stream.write(''.join(f'{json.dumps(record, default=str)}\n' for record in batch))
+                self._stream.flush()
+
+
+def read(path):
+    """ yield export records from path
+    """
+    with open(path, encoding='utf-8') as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def replay(path, speed=1., lines=None):
+    """ re-render an exported session
+        speed is a multiplier of the recorded pace, 0 replays without delay
+        lines defaults to a Lines created from the first recorded init
+        returns lines
+    """
+    from list2term import Lines
+    previous = None
+    context = None
+    try:
+        for record in read(path):
+            if speed and previous is not None:
+                time.sleep(max(record['ts'] - previous, 0) / speed)
+            previous = record['ts']
+            op = record['op']
+            if op == 'init':
+                if lines is None:
+                    lines = Lines(data=list(record['value']), lookup=record['key'])
+                    context = lines.__enter__()
+                else:
+                    for index, value in enumerate(record['value']):
+                        lines[index] = value
+            elif op == 'set':
+                lines[record['index']] = record['value']
+            elif op == 'append':
+                lines.append(record['value'])
+            elif op == 'pop':
+                lines.pop(record['index'])
+            elif op == 'delete':
+                del lines[record['index']]
+            elif op == 'clear':
+                lines.clear()
+            elif op == 'sync':
+                lines.sync(record['value'])
+    finally:
+        if context:
+            context.__exit__(None, None, None)
+    return lines
+
+
+def main(argv=None):  # pragma: no cover
+    """ replay an exported session
+    """
+    parser = argparse.ArgumentParser(prog='python -m list2term.export', description='replay a list2term jsonl export')
+    parser.add_argument('path', help='path of jsonl export')
+    parser.add_argument('--speed', type=float, default=1., help='speed multiplier, 0 replays without delay')
+    args = parser.parse_args(argv)
+    replay(args.path, speed=args.speed)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -3,25 +3,44 @@ import re
 import sys
 import cursor
 import logging
+import time
+import itertools
 import threading
+from array import array
 from collections import UserList
+from collections import Counter
+from contextlib import nullcontext
+from difflib import SequenceMatcher
 from colorama import init as colorama_init
 from colorama import Style
 from colorama import Fore
 from colorama import Cursor
+from list2term.view import SortedView
+from list2term.cells import Cell
+from list2term.shards import ShardedUpdates
+from list2term.compact import CompactRows
+from list2term.compact import to_text
 
 logger = logging.getLogger(__name__)
 
 MAX_CHARS = 150
+FRAME_INTERVAL = .1
 CLEAR_EOL = '\033[K'
+INSERT_LINES = '\033[{}L'
+DELETE_LINES = '\033[{}M'
 BRIGHT_YELLOW = Style.BRIGHT + Fore.YELLOW
+STALE_COLOR = Style.BRIGHT + Fore.RED
 LINE_RE = re.compile(r'^(?P<line_id>.*)->(?P<message>.*)$')
+ANSI_RE = re.compile(r'\033\[[0-9;?]*[A-Za-z]')
 
 
 class Lines(UserList):
 
     def __init__(self, data=None, size=None, lookup=None, show_index=True, show_x_axis=False,
-                 max_chars=None, use_color=True, y_axis_labels=None, x_axis=None):
+                 max_chars=None, use_color=True, y_axis_labels=None, x_axis=None,
+                 max_bytes_per_second=None, frame_interval=FRAME_INTERVAL, exporter=None,
+                 sort_key=None, collapse=None, stale_after=None, on_stale=None, snapshot=None,
+                 animate=None, shards=None, compact=False, finished=None):
         """ constructor
         """
         logger.debug('executing Lines constructor')
@@ -39,25 +58,83 @@ class Lines(UserList):
             sys.stderr.flush()
         data = Lines._get_data(data, size, lookup)
         Lines._validate_lookup(lookup, data)
-        Lines._validate_data(data, self._isatty)
+        if not (sort_key or collapse):
+            Lines._validate_data(data, self._isatty)
         super().__init__(initlist=data)
+        if compact:
+            # items are stored as text, each distinct text once
+            self.data = CompactRows(self.data)
         self._max_chars = max_chars if max_chars else MAX_CHARS
         self._fill = len(str(len(self.data) - 1))
         self._current = 0
         self._show_index = show_index
         self._show_x_axis = show_x_axis
-        self._lookup = lookup
+        self._lookup = list(lookup) if lookup is not None else None
         self._lookup_map = {key: index for index, key in enumerate(lookup)} if lookup else None
         self._use_color = use_color
         if y_axis_labels and len(y_axis_labels) != len(self.data):
             raise ValueError('size of y_axis_labels must equal size of data')
-        self._y_axis_labels = y_axis_labels
+        self._y_axis_labels = list(y_axis_labels) if y_axis_labels is not None else None
         self._y_axis_labels_max_len = (
             Lines.max_len(y_axis_labels)
             if y_axis_labels
             else len(str(len(self.data) - 1))
         )
         self._x_axis = x_axis
+        self._frame_interval = frame_interval
+        self._clock = None
+        self._clock_stop = threading.Event()
+        # bandwidth budget, rows updated while the clock runs are deferred to the next frame
+        # and printed by priority then most recently changed within the frame byte budget
+        self._max_budget = max_bytes_per_second * frame_interval if max_bytes_per_second else None
+        self._budget = self._max_budget
+        self._deferred = {}
+        self._priorities = {}
+        self._sequence = itertools.count()
+        self._exporter = exporter
+        if exporter:
+            exporter.record('init', key=lookup, value=list(self.data))
+        # when lines are displayed in a view order each screen row is painted only
+        # when the text displayed at that row changes
+        if (sort_key or collapse) and max_bytes_per_second:
+            raise ValueError('max_bytes_per_second is not supported with sort_key or collapse')
+        # finished lines are collapsed into counts by state shown in a summary row
+        self._collapse = collapse
+        self._states = {}
+        self._state_counts = Counter()
+        self._started = time.monotonic()
+        self._view = None
+        if sort_key or collapse:
+            visible = (lambda value: not collapse(value)) if collapse else None
+            self._view = SortedView(key=sort_key, visible=visible)
+            self._view.rebuild(self.data)
+            if collapse:
+                self._count_states()
+            # only visible lines and the summary row are displayed
+            Lines._validate_data(self.data, self._isatty, rows=len(self._view) + (1 if collapse else 0))
+        self._screen = []
+        # last update time of each line, lines not updated for stale_after seconds are
+        # highlighted with their idle time and passed to on_stale when they become stale,
+        # finished lines are never stale
+        self._stale_after = stale_after
+        self._on_stale = on_stale
+        self._finished = finished or collapse
+        self._updated = array('d', [time.monotonic()]) * len(self.data)
+        self._stale = {}
+        # rendered lines are published to the snapshot once per frame, only lines
+        # updated since the previous frame are written unless the list changed size
+        self._snapshot = snapshot
+        self._snapshot_dirty = set()
+        self._snapshot_all = True
+        # lines holding cells are reprinted by the clock when their rendered text
+        # changes, animate converts messages written to lines into cells
+        self._animate = animate
+        self._cells = {}
+        self._index_cells()
+        self._active = False
+        # lines set within the context manager are stored by writer threads in shards
+        # without taking the lock and applied by the render clock every frame
+        self._shards = ShardedUpdates(shards) if shards else None
         colorama_init()
 
     def __enter__(self):
@@ -67,28 +144,128 @@ class Lines(UserList):
             self._hide_cursor()
             self._print_x_axis(force=True)
             self._print_lines(force=False)
+            self._active = True
+            self._start_clock()
             return self
 
     def __exit__(self, *args):
         """ on exit show cursor if stderr is attached to tty and print items
         """
+        self._active = False
+        self._stop_clock()
         with self._lock:
+            if self._shards:
+                self._apply_shards()
             self._print_lines(force=True)
             self._show_cursor()
+            if self._snapshot:
+                self._publish_snapshot()
+                self._snapshot.close()
+        if self._exporter:
+            self._exporter.close()
 
     def __setitem__(self, index, item):
         """ set item override
         """
+        if self._shards is not None and self._active:
+            self._set_sharded(index, item)
+            return
         with self._lock:
-            self.data[index] = item
+            self._set(index, item)
+
+    def __getitem__(self, index):
+        """ get item override, returns items set but not yet applied by the render clock
+        """
+        if self._shards is not None and isinstance(index, int):
+            item = self.data[index]
+            return self._shards.get(index if index >= 0 else index + len(self.data), item)
+        return super().__getitem__(index)
+
+    def _set(self, index, item):
+        """ set item at index and print it
+        """
+        if self._animate and isinstance(item, str):
+            item = self._animate(item)
+        self.data[index] = item
+        self._updated[index] = time.monotonic()
+        position = index if index >= 0 else index + len(self.data)
+        if self._stale:
+            self._stale.pop(position, None)
+        if self._snapshot:
+            self._snapshot_dirty.add(position)
+        if isinstance(item, Cell) and self.data[position] is item:
+            self._cells[position] = None
+            self._start_cell_clock()
+        elif self._cells:
+            self._cells.pop(position, None)
+        if self._exporter:
+            self._export('set', index, item)
+        if self._view is not None:
+            self._update_view(index)
+        elif self._clock and self._max_budget and self._isatty:
+            self._defer(index)
+        else:
             self._print_line(index)
 
+    def _set_sharded(self, index, item):
+        """ store item in the shard of index to be applied by the render clock
+        """
+        length = len(self.data)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('list assignment index out of range')
+        self._shards.put(index, item)
+
+    def _apply_shards(self):
+        """ apply items stored in shards since the previous frame
+        """
+        for index, item in self._shards.take().items():
+            if index < len(self.data):
+                self._set(index, item)
+
+    def stale(self, threshold=None):
+        """ return list of (index, seconds) of lines not updated for threshold seconds
+            threshold defaults to stale_after
+        """
+        threshold = self._stale_after if threshold is None else threshold
+        if threshold is None:
+            raise ValueError('a threshold or stale_after must be provided')
+        with self._lock:
+            now = time.monotonic()
+            return [
+                (index, now - updated)
+                for index, updated in enumerate(self._updated)
+                if now - updated >= threshold and not self._is_finished(index)
+            ]
+
+    def _is_finished(self, index):
+        """ return True if line at index is finished
+        """
+        return bool(self._finished and self._finished(self.data[index]))
+
+    def set_priority(self, index, priority):
+        """ set print priority of line at index when a bandwidth budget is set
+            deferred lines with higher priority are printed first
+        """
+        with self._lock:
+            self._priorities[index] = priority
+
     def __delitem__(self, index):
         """ delete item override
         """
         with self._lock:
+            if self._shards:
+                self._apply_shards()
             length = len(self.data)
             del self.data[index]
+            del self._updated[index]
+            self._snapshot_all = True
+            if self._cells:
+                self._index_cells()
+            self._stale.clear()
+            if self._exporter:
+                self._export('delete', index)
             if isinstance(index, int):
                 # clear last line
                 self._clear_line(length - 1)
@@ -102,19 +279,157 @@ class Lines(UserList):
         """
         with self._lock:
             # need to add validation here
+            if self._animate and isinstance(item, str):
+                item = self._animate(item)
             self.data.append(item)
+            self._updated.append(time.monotonic())
+            self._snapshot_all = True
+            if isinstance(item, Cell) and self.data[-1] is item:
+                self._cells[len(self.data) - 1] = None
+                self._start_cell_clock()
+            if self._exporter:
+                self._export('append', len(self.data) - 1, item)
             self._print_lines()
 
+    def add_line(self, line_id, item='', label=None):
+        """ append item as a new line that messages for line_id are routed to
+            label is appended to y axis labels when they are set
+            returns index of the new line
+        """
+        with self._lock:
+            if self._lookup is None:
+                if self.data:
+                    raise ValueError('lines without lookup can not add lines by id')
+                self._lookup = []
+            if self._lookup_map is None:
+                self._lookup_map = {}
+            if line_id in self._lookup_map:
+                raise ValueError(f'line id {line_id} already exists')
+            index = len(self.data)
+            self._lookup.append(line_id)
+            self._lookup_map[line_id] = index
+            if self._y_axis_labels is not None:
+                label = str(line_id) if label is None else label
+                self._y_axis_labels.append(label)
+                self._y_axis_labels_max_len = Lines.max_len(self._y_axis_labels)
+            self.append(item)
+            return index
+
+    def index_of(self, line_id):
+        """ return index of line that messages for line_id are routed to or None
+        """
+        return self._lookup_map.get(line_id) if self._lookup_map else None
+
+    def remove_line(self, line_id):
+        """ remove line added for line_id along with its lookup id and label
+        """
+        with self._lock:
+            if not self._lookup_map or line_id not in self._lookup_map:
+                raise ValueError(f'line id {line_id} does not exist')
+            index = self._lookup_map[line_id]
+            del self._lookup[index]
+            self._lookup_map = {key: position for position, key in enumerate(self._lookup)}
+            if self._y_axis_labels is not None:
+                del self._y_axis_labels[index]
+                self._y_axis_labels_max_len = Lines.max_len(self._y_axis_labels)
+            del self[index]
+
     def pop(self, index=-1):
         """ pop override
         """
         with self._lock:
+            if self._shards:
+                self._apply_shards()
             self.data.pop(index)
+            self._updated.pop(index)
+            self._snapshot_all = True
+            if self._cells:
+                self._index_cells()
+            self._stale.clear()
+            if self._exporter:
+                self._export('pop', index)
             # clear supposed last line in terminal
             self._clear_line(len(self.data))
             start = index if index > 0 else None
             self._print_lines(from_index=start)
 
+    def sync(self, items):
+        """ update lines to match items printing only what changed
+            a minimal edit script is computed between the displayed and new items and
+            applied as line updates, insertions and deletions, when indices are not shown
+            the terminal inserts and deletes lines so following lines are not reprinted
+        """
+        with self._lock:
+            if self._lookup or self._y_axis_labels:
+                raise ValueError('sync is not supported with lookup or y_axis_labels')
+            if self._shards:
+                self._apply_shards()
+            items = list(items)
+            matcher = SequenceMatcher(
+                None,
+                [self._sanitize(item) for item in self.data],
+                [self._sanitize(item) for item in items],
+                autojunk=False)
+            opcodes = matcher.get_opcodes()
+            updated = array('d', [time.monotonic()]) * len(items)
+            for tag, i1, i2, j1, j2 in opcodes:
+                if tag == 'equal':
+                    updated[j1:j2] = self._updated[i1:i2]
+            length = len(self.data)
+            self.data[:] = items
+            self._updated = updated
+            self._snapshot_all = True
+            self._index_cells()
+            self._stale.clear()
+            if self._exporter:
+                self._export('sync', item=items)
+            if self._view is not None:
+                self._print_lines()
+            elif self._isatty:
+                self._apply_opcodes(opcodes, length)
+
+    def _apply_opcodes(self, opcodes, length):
+        """ print edit script opcodes that transformed length displayed lines into data
+        """
+        rows = length
+        redraw_from = None
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == 'equal':
+                continue
+            common = min(i2 - i1, j2 - j1)
+            if redraw_from is None:
+                for index in range(j1, j1 + common):
+                    self._print_line(index)
+            deleted = i2 - i1 - common
+            inserted = j2 - j1 - common
+            row = j1 + common
+            if not (deleted or inserted):
+                continue
+            if self._show_index:
+                # indices of all following lines change
+                if redraw_from is None:
+                    redraw_from = row
+                continue
+            if deleted:
+                move_char = self._get_move_char(row)
+                print(f'{move_char}{DELETE_LINES.format(deleted)}', end='', file=sys.stderr)
+                rows -= deleted
+            if inserted:
+                # add rows below the lines scrolling the terminal if at the bottom
+                move_char = self._get_move_char(rows)
+                print(move_char + '\n' * inserted, end='', file=sys.stderr)
+                self._current = rows + inserted
+                move_char = self._get_move_char(row)
+                print(f'{move_char}{INSERT_LINES.format(inserted)}', end='', file=sys.stderr)
+                rows += inserted
+                for index in range(row, row + inserted):
+                    self._print_line(index)
+        if redraw_from is not None:
+            for index in range(len(self.data), length):
+                self._clear_line(index)
+            self._print_lines(from_index=redraw_from)
+        sys.stderr.flush()
+
     def remove(self, item):
         """ remove override
         """
@@ -124,15 +439,162 @@ class Lines(UserList):
         """ clear override
         """
         with self._lock:
+            if self._shards:
+                self._apply_shards()
             length = len(self.data)
             self.data.clear()
+            del self._updated[:]
+            self._snapshot_all = True
+            if self._cells:
+                self._index_cells()
+            self._stale.clear()
+            if self._exporter:
+                self._export('clear')
+            if self._view is not None:
+                self._print_lines()
+                return
             if self._isatty:
                 for index in range(0, length):
                     self._clear_line(index)
 
+    def _export(self, op, index=None, item=None):
+        """ record update with exporter
+        """
+        key = None
+        if self._lookup and index is not None and -len(self._lookup) <= index < len(self._lookup):
+            key = self._lookup[index]
+        self._exporter.record(op, index=index, key=key, value=item)
+
+    def _update_view(self, index):
+        """ move index to its position in view and paint the rows between its
+            old and new positions
+        """
+        if index < 0:
+            index += len(self.data)
+        old, new = self._view.update(index, self.data[index])
+        if self._collapse:
+            self._count_state(index)
+        if not self._isatty:
+            return
+        positions = [position for position in (old, new) if position is not None]
+        if positions:
+            start = min(positions)
+            # rows after a shown or hidden row move by one
+            stop = max(positions) if len(positions) == 2 else len(self._view) - 1
+            for row in range(start, stop + 1):
+                self._paint_row(row, self._render(self._view.index_at(row)))
+        if self._collapse:
+            self._paint_summary()
+
+    def _paint_view(self, force=False):
+        """ rebuild view and paint rows whose text changed clearing rows no longer displayed
+        """
+        self._view.rebuild(self.data)
+        if self._collapse:
+            self._count_states()
+        indices = self._view.indices()
+        if not self._isatty:
+            if force:
+                for index in indices:
+                    print(self._render(index), file=sys.stderr)
+                if self._collapse:
+                    print(self._get_summary(), file=sys.stderr)
+            return
+        for row, index in enumerate(indices):
+            self._paint_row(row, self._render(index))
+        if self._collapse:
+            self._paint_summary()
+        else:
+            self._trim_screen(len(indices))
+
+    def _paint_summary(self):
+        """ paint summary row below the displayed lines
+        """
+        rows = len(self._view)
+        self._paint_row(rows, self._get_summary())
+        self._trim_screen(rows + 1)
+
+    def _trim_screen(self, rows):
+        """ clear screen rows after rows
+        """
+        for row in range(rows, len(self._screen)):
+            move_char = self._get_move_char(row)
+            print(f'{move_char}{CLEAR_EOL}', end='', file=sys.stderr)
+        del self._screen[rows:]
+        sys.stderr.flush()
+
+    def _count_state(self, index):
+        """ update count of collapsed lines by state for line at index
+        """
+        state = self._collapse(self.data[index]) or None
+        previous = self._states.get(index)
+        if state == previous:
+            return
+        if previous is not None:
+            self._state_counts[previous] -= 1
+            if not self._state_counts[previous]:
+                del self._state_counts[previous]
+        if state is None:
+            del self._states[index]
+        else:
+            self._states[index] = state
+            self._state_counts[state] += 1
+
+    def _count_states(self):
+        """ count collapsed lines by state
+        """
+        self._states = {}
+        for index, value in enumerate(self.data):
+            state = self._collapse(value)
+            if state:
+                self._states[index] = state
+        self._state_counts = Counter(self._states.values())
+
+    def _get_summary(self):
+        """ return summary of collapsed lines
+        """
+        collapsed = len(self._states)
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        counts = ' '.join(f'{state}: {count}' for state, count in sorted(self._state_counts.items(), key=str))
+        return f'{counts or "collapsed: 0"} | active: {len(self._view)} | {collapsed / elapsed:.1f}/s'
+
+    def _paint_row(self, row, text):
+        """ print text at screen row when it differs from the text displayed
+        """
+        if row < len(self._screen):
+            if self._screen[row] == text:
+                return
+            self._screen[row] = text
+        else:
+            self._screen.append(text)
+        move_char = self._get_move_char(row)
+        print(f'{move_char}{CLEAR_EOL}{text}', file=sys.stderr)
+        sys.stderr.flush()
+        self._current = row + 1
+
+    def _render(self, index):
+        """ return text displayed for item at index
+            stale lines are highlighted and show their idle time
+        """
+        text = self._sanitize(self.data[index])
+        if self._stale:
+            age = self._stale.get(index)
+            if age is not None:
+                text = f'{STALE_COLOR}{text}{Style.RESET_ALL}' if self._use_color else text
+                text = f'{text} [idle {age}s]'
+        return f'{self._get_str_index(index)}{text}'
+
+    def _get_row_count(self):
+        """ return number of rows displayed
+        """
+        return len(self._screen) if self._view is not None else len(self.data)
+
     def _clear_line(self, index):
         """ clear line at index
         """
+        if self._view is not None:
+            # rows no longer displayed are cleared when the view is painted
+            return
         if self._isatty:
             with self._lock:
                 move_char = self._get_move_char(index)
@@ -146,11 +608,185 @@ class Lines(UserList):
                 # ensure single thread access
                 move_char = self._get_move_char(index)
                 print(f'{move_char}{CLEAR_EOL}', end='', file=sys.stderr)
-                sanitized = self._sanitize(self.data[index])
-                str_index = self._get_str_index(index)
-                print(f'{str_index}{sanitized}', file=sys.stderr)
+                print(self._render(index), file=sys.stderr)
                 sys.stderr.flush()
                 self._current = index + 1
+                self._deferred.pop(index, None)
+
+    def _defer(self, index):
+        """ defer printing line at index to the next frame
+        """
+        if index < 0:
+            index += len(self.data)
+        self._deferred[index] = next(self._sequence)
+
+    def _needs_clock(self):
+        """ return True if a feature requires lines to be printed on a clock
+        """
+        clocked = self._stale_after or self._snapshot or self._cells or self._shards is not None
+        return bool(self._max_budget and self._isatty) or bool(clocked)
+
+    def _start_cell_clock(self):
+        """ start clock to animate cells set within the context manager
+        """
+        if self._active and self._clock is None:
+            self._start_clock()
+
+    def _index_cells(self):
+        """ index lines holding cells
+        """
+        self._cells = {index: None for index, item in enumerate(self.data) if isinstance(item, Cell)}
+
+    def _start_clock(self):
+        """ start thread printing frames every frame interval when required
+        """
+        if self._clock is None and self._needs_clock():
+            self._clock_stop.clear()
+            self._clock = threading.Thread(target=self._run_clock, name='lines-clock', daemon=True)
+            self._clock.start()
+
+    def _stop_clock(self):
+        """ stop thread printing frames
+        """
+        if self._clock is not None:
+            self._clock_stop.set()
+            self._clock.join()
+            self._clock = None
+
+    def _run_clock(self):
+        """ print a frame every frame interval until stopped
+        """
+        while not self._clock_stop.wait(self._frame_interval):
+            self._tick()
+
+    def _tick(self):
+        """ print a single frame
+        """
+        with self._lock:
+            if self._shards:
+                self._apply_shards()
+            if self._cells:
+                self._animate_cells()
+            self._print_deferred()
+            if self._stale_after:
+                self._check_stale()
+            if self._snapshot:
+                self._publish_snapshot()
+
+    def _publish_snapshot(self):
+        """ publish lines changed since the previous frame to the snapshot
+            in view mode every displayed row is published in view order followed by
+            the summary row since an update can move rows
+        """
+        if not self._snapshot_all and not self._snapshot_dirty:
+            return
+        if self._view is not None:
+            indices = self._view.indices()
+            count = len(indices) + (1 if self._collapse else 0)
+            texts = map(self._render, indices)
+            if self._collapse:
+                texts = itertools.chain(texts, (self._get_summary(),))
+            rows = enumerate(texts)
+        else:
+            count = len(self.data)
+            indices = range(count) if self._snapshot_all else sorted(self._snapshot_dirty)
+            rows = ((index, self._render(index)) for index in indices)
+        snapshot = self._snapshot
+        snapshot.begin()
+        snapshot.set_count(count)
+        for row, text in rows:
+            if row >= snapshot.rows:
+                break
+            snapshot.write_row(row, ANSI_RE.sub('', text))
+        snapshot.end()
+        self._snapshot_dirty.clear()
+        self._snapshot_all = False
+
+    def _animate_cells(self):
+        """ print lines holding cells whose rendered text changed
+        """
+        now = time.monotonic()
+        changed = []
+        for index, text in self._cells.items():
+            rendered = self.data[index].render(now)
+            if rendered != text:
+                self._cells[index] = rendered
+                changed.append(index)
+        for index in changed:
+            if self._max_budget and self._isatty:
+                self._defer(index)
+            else:
+                self._print_index(index)
+        if self._snapshot:
+            self._snapshot_dirty.update(changed)
+
+    def _check_stale(self):
+        """ print lines whose idle time shown changed and call on_stale with lines
+            that became stale, finished lines are not stale
+        """
+        now = time.monotonic()
+        stale = {}
+        for index, updated in enumerate(self._updated):
+            if now - updated >= self._stale_after and not self._is_finished(index):
+                stale[index] = int(now - updated)
+        changed = [index for index, age in stale.items() if self._stale.get(index) != age]
+        became_stale = [(index, now - self._updated[index]) for index in stale if index not in self._stale]
+        self._stale = stale
+        for index in changed:
+            self._print_index(index)
+        if self._snapshot:
+            self._snapshot_dirty.update(changed)
+        if became_stale and self._on_stale:
+            self._on_stale(became_stale)
+
+    def _print_index(self, index):
+        """ print line at index wherever it is displayed
+        """
+        if self._view is None:
+            self._print_line(index)
+        elif self._isatty:
+            row = self._view.position_of(index)
+            if row is not None:
+                self._paint_row(row, self._render(index))
+
+    def _print_deferred(self):
+        """ print deferred lines within the frame byte budget and adapt the budget
+            to the time taken to write the frame
+        """
+        if not self._deferred:
+            return
+        length = len(self.data)
+        ordered = sorted(
+            self._deferred,
+            key=lambda index: (-self._priorities.get(index, 0), -self._deferred[index]))
+        frame = []
+        size = 0
+        for index in ordered:
+            if index >= length:
+                del self._deferred[index]
+                continue
+            text = f'{CLEAR_EOL}{self._render(index)}\n'
+            text_size = len(text.encode('utf-8', errors='replace'))
+            if frame and size + text_size > self._budget:
+                break
+            text = f'{self._get_move_char(index)}{text}'
+            frame.append(text)
+            size += text_size
+            self._current = index + 1
+            del self._deferred[index]
+        start = time.perf_counter()
+        print(''.join(frame), end='', file=sys.stderr)
+        sys.stderr.flush()
+        self._adapt_budget(time.perf_counter() - start)
+
+    def _adapt_budget(self, elapsed):
+        """ halve the budget when writing a frame blocks for a large part of the frame
+            interval otherwise grow it back towards the maximum budget
+        """
+        if elapsed > self._frame_interval / 2:
+            self._budget = max(self._budget / 2, 1)
+        elif elapsed < self._frame_interval / 10:
+            self._budget = min(self._budget * 1.25, self._max_budget)
 
     def _get_str_index(self, index):
         """ return index with y axis label if set
@@ -165,22 +801,28 @@ class Lines(UserList):
             return f'{label}: '
         return f'{BRIGHT_YELLOW}{label}{Style.RESET_ALL}: '
 
+    def _get_x_axis_lines(self):
+        """ return list of x axis lines to print when set
+        """
+        if not self._show_x_axis:
+            return []
+        if isinstance(self._x_axis, list):
+            return self._x_axis
+        if self._x_axis:
+            return [self._x_axis]
+        return [
+            ''.join(
+                str(round(i / 10))[-1] if i % 10 == 0 else '.'
+                for i in range(self._max_chars)
+            )
+        ]
+
     def _print_x_axis(self, force=False):
         """ print x axis when set (supports single string or list of strings)
         """
         if (self._isatty or force) and self._show_x_axis:
             with self._lock:
-                if isinstance(self._x_axis, list):
-                    x_axis_lines = self._x_axis
-                elif self._x_axis:
-                    x_axis_lines = [self._x_axis]
-                else:
-                    x_axis_lines = [
-                        ''.join(
-                            str(round(i / 10))[-1] if i % 10 == 0 else '.'
-                            for i in range(self._max_chars)
-                        )
-                    ]
+                x_axis_lines = self._get_x_axis_lines()
 
                 # add padding for y axis labels the + 2 is for ': '
                 spaces = (
@@ -197,13 +839,49 @@ class Lines(UserList):
                     else:
                         print(f"{spaces}{x_axis}", file=sys.stderr)
 
+    def print_above(self, message):
+        """ print message above the lines without redrawing them
+            blank lines are inserted above the lines pushing them down so
+            printed messages scroll off the top of the terminal natively
+        """
+        with self._lock:
+            if not self._isatty:
+                print(message, file=sys.stderr)
+                return
+            texts = [self._fit_to_terminal(text) for text in str(message).split('\n')]
+            count = len(texts)
+            top = -len(self._get_x_axis_lines())
+            # add rows below the lines scrolling the terminal if at the bottom
+            move_char = self._get_move_char(self._get_row_count())
+            print(move_char + '\n' * count, end='', file=sys.stderr)
+            self._current += count
+            # insert blank rows at the top, the lines move down by count rows
+            move_char = self._get_move_char(top)
+            print(f'{move_char}{INSERT_LINES.format(count)}', end='', file=sys.stderr)
+            for text in texts:
+                print(f'{text}{CLEAR_EOL}', file=sys.stderr)
+            sys.stderr.flush()
+            self._current = top
+
+    def _fit_to_terminal(self, text):
+        """ truncate text to terminal width so it occupies a single row
+        """
+        try:
+            columns = os.get_terminal_size().columns
+        except OSError:
+            return text
+        return text if len(text) < columns else text[:columns - 1]
+
     def _print_lines(self, force=False, from_index=None):
         """ print all items
         """
         if from_index is None:
             from_index = 0
         logger.debug('printing all items starting at index %s', from_index)
-        if (self._isatty or force):
+        if self._view is not None:
+            with self._lock:
+                self._paint_view(force=force)
+        elif (self._isatty or force):
             with self._lock:
                 for index, _ in enumerate(self.data[from_index:], from_index):
                     self._print_line(index, force=force)
@@ -253,16 +931,7 @@ class Lines(UserList):
             - other objects via str()
             Truncates to max_chars and strips after first newline.
         """
-        if item is None:
-            s = ''
-        elif isinstance(item, str):
-            s = item
-        elif isinstance(item, (list, tuple)):
-            # join parts safely (preserves ANSI sequences if present)
-            s = ''.join('' if part is None else str(part) for part in item)
-        else:
-            # fallback: try to string-ify
-            s = str(item)
+        s = to_text(item)
 
         # keep first line only
         s = s.split('\n', 1)[0]
@@ -299,8 +968,12 @@ class Lines(UserList):
                 the index of line_id within lookup
                 extracting line_id contained within item
         """
-        with self._lock:
+        # the lock is not needed to route messages when lines are set in shards
+        lock = nullcontext() if self._shards is not None and self._active else self._lock
+        with lock:
             index, message = self._get_index_message(item, line_id=line_id)
+            if self._animate and isinstance(message, str):
+                message = self._animate(message)
             if index is not None:
                 if self[index] != message:
                     # no need to set value at index if it is already set
@@ -310,7 +983,7 @@ class Lines(UserList):
     def _get_data(data, size, lookup):
         """ return data list or generate from size or lookup
         """
-        if data:
+        if data is not None:
             return data
         if size:
             return [''] * size
@@ -329,17 +1002,19 @@ class Lines(UserList):
                 raise ValueError('size of lookup must equal size of data')
 
     @staticmethod
-    def _validate_data(data, isatty):
+    def _validate_data(data, isatty, rows=None):
         """ validate data list can be displayed on terminal
+            rows is the number of rows displayed and defaults to the size of data
         """
         if isatty:
             try:
                 size = os.get_terminal_size()
             except OSError:
                 return
-            if len(data) > size.lines:
+            rows = len(data) if rows is None else rows
+            if rows > size.lines:
                 raise ValueError(
-                    f'number of items to display {len(data)} '
+                    f'number of items to display {rows} '
                     f'exceeds current terminal lines size {size.lines}'
                 )
 
@@ -350,3 +1025,22 @@ class Lines(UserList):
         if not items:
             return 0
         return max(len(i) for i in items)
+
+
+class LinesHandler(logging.Handler):
+    """ logging handler that prints records above a Lines instance
+    """
+
+    def __init__(self, lines, level=logging.NOTSET):
+        """ constructor
+        """
+        super().__init__(level=level)
+        self._lines = lines
+
+    def emit(self, record):
+        """ print formatted record above lines
+        """
+        try:
+            self._lines.print_above(self.format(record))
+        except Exception:
+            self.handleError(record)
@@ -1,16 +1,27 @@
 import sys
+import time
 import logging
+import threading
+from collections import deque
+from statistics import median
 from multiprocessing import Pool
 from multiprocessing import get_context
 from multiprocessing import cpu_count
 from multiprocessing.queues import Queue
 from multiprocessing.managers import BaseManager
 from queue import Empty
+from queue import Full
 from contextlib import nullcontext
 from list2term import Lines
+from list2term.list2term import LINE_RE
+from list2term.tracing import TracedWriter
+from list2term.tracing import TimedTask
 
 logger = logging.getLogger(__name__)
 CONCURRENCY = cpu_count()
+OVERFLOW_POLICIES = ('block', 'drop-oldest', 'latest')
+SUMMARY_ID = 'concurrency'
+CPU_SATURATION = .9
 
 
 class LinesQueue(Queue):  # pragma: no cover
@@ -18,41 +29,530 @@ class LinesQueue(Queue):  # pragma: no cover
         super().put(*args, **kwargs)
 
 
+class BoundedLinesQueue:
+    """ bounded queue of messages with a policy applied when the queue is full:
+            block: writers wait until there is room
+            drop-oldest: the oldest pending message is discarded
+            latest: a pending message for the same line id is replaced by the new
+                message, otherwise the oldest pending message is discarded
+        dropped and merged messages are counted and returned by stats
+    """
+
+    def __init__(self, maxsize, overflow='block'):
+        """ constructor
+        """
+        if maxsize <= 0:
+            raise ValueError('maxsize must be greater than 0')
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'overflow must be one of {OVERFLOW_POLICIES}')
+        self._maxsize = maxsize
+        self._overflow = overflow
+        # each entry is a [line_id, item] pair so latest can replace an item in place
+        self._entries = deque()
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._dropped = 0
+        self._merged = 0
+
+    def write(self, item, block=True, timeout=None):
+        """ put item on queue applying the overflow policy
+        """
+        self.put(item, block=block, timeout=timeout)
+
+    def put(self, item, block=True, timeout=None):
+        """ put item on queue applying the overflow policy
+        """
+        with self._condition:
+            line_id = self._get_line_id(item) if self._overflow == 'latest' else None
+            if line_id is not None and line_id in self._pending:
+                self._pending[line_id][1] = item
+                self._merged += 1
+                return
+            if len(self._entries) >= self._maxsize:
+                if self._overflow == 'block':
+                    if not block:
+                        raise Full
+                    if not self._condition.wait_for(lambda: len(self._entries) < self._maxsize, timeout):
+                        raise Full
+                else:
+                    self._discard(self._entries.popleft())
+                    self._dropped += 1
+            entry = [line_id, item]
+            self._entries.append(entry)
+            if line_id is not None:
+                self._pending[line_id] = entry
+            self._condition.notify_all()
+
+    def get(self, block=True, timeout=None):
+        """ remove and return the oldest item on queue
+        """
+        with self._condition:
+            if not block:
+                if not self._entries:
+                    raise Empty
+            elif not self._condition.wait_for(lambda: self._entries, timeout):
+                raise Empty
+            entry = self._entries.popleft()
+            self._discard(entry)
+            self._condition.notify_all()
+            return entry[1]
+
+    def qsize(self):
+        """ return number of pending items
+        """
+        with self._condition:
+            return len(self._entries)
+
+    def stats(self):
+        """ return counts of dropped and merged messages
+        """
+        with self._condition:
+            return {'dropped': self._dropped, 'merged': self._merged}
+
+    def _discard(self, entry):
+        """ remove entry from pending line ids
+        """
+        if entry[0] is not None and self._pending.get(entry[0]) is entry:
+            del self._pending[entry[0]]
+
+    @staticmethod
+    def _get_line_id(item):
+        """ return line id contained within item
+        """
+        if isinstance(item, tuple):
+            # traced message
+            item = item[-1]
+        if isinstance(item, str):
+            match = LINE_RE.match(item)
+            if match:
+                return match.group('line_id').strip()
+        return None
+
+
 class QueueManager(BaseManager):  # pragma: no cover
     # Managers provide a way to create data which can be shared between different processes
     pass
 
 
-def pool_map(function, iterable, context=None, print_status=True, processes=None):  # pragma: no cover
+def _create_queue(manager, maxsize=None, overflow='block'):  # pragma: no cover
+    """ return a queue proxy hosted by manager, bounded when maxsize is set
+    """
+    if maxsize:
+        return manager.BoundedLinesQueue(maxsize, overflow)
+    return manager.LinesQueue(ctx=get_context())
+
+
+def _drain(lines_queue, results, lines, print_status, tracer=None):  # pragma: no cover
+    """ write messages from lines_queue to lines until results are ready
+    """
+    while True:
+        try:
+            _handle_item(lines_queue.get(timeout=.1), lines, print_status, tracer)
+        except Empty:
+            if results.ready():
+                break
+
+
+def _handle_item(item, lines, print_status, tracer=None):  # pragma: no cover
+    """ write item recording its latency when traced
+    """
+    if tracer:
+        tracer.handle(item, lambda message: _write_item(message, lines, print_status))
+    else:
+        _write_item(item, lines, print_status)
+
+
+def _get_process_data(function, iterable, lines_queue, tracer=None):  # pragma: no cover
+    """ return function and list of arguments with lines_queue appended to each
+        when traced the function is timed and lines_queue timestamps messages
+    """
+    if tracer:
+        function = TimedTask(function)
+        lines_queue = TracedWriter(lines_queue)
+    return function, [item + (lines_queue,) for item in iterable]
+
+
+class CpuTimedTask:
+    """ wrapper of a worker function that returns its result with the cpu seconds it used
+    """
+
+    def __init__(self, function):
+        """ constructor
+        """
+        self._function = function
+
+    def __call__(self, *args):
+        started = time.process_time()
+        result = self._function(*args)
+        return result, time.process_time() - started
+
+
+def _write_item(item, lines, print_status):  # pragma: no cover
+    """ write item to lines or print it to stderr when there are no lines
+    """
+    if lines:
+        lines.write(item)
+    else:
+        if print_status:
+            print(item, file=sys.stderr)
+
+
+class AdaptiveConcurrency:
+    """ hill climbing controller for the number of tasks in flight
+        after every window of completed tasks the limit is moved by a step in the
+        current direction, the direction is reversed when throughput drops and the
+        limit is reduced when latency grows without a gain in throughput or when the
+        tasks completed in the window used most of the cpus
+    """
+
+    def __init__(self, initial, minimum=1, maximum=None, window=None):
+        """ constructor
+        """
+        self.maximum = maximum if maximum else max(initial, CONCURRENCY * 4)
+        self.limit = min(initial, self.maximum)
+        self.throughput = 0.
+        self._minimum = minimum
+        self._window = window
+        self._direction = 1
+        self._previous = None
+        self._latencies = []
+        self._cpu = 0.
+        self._window_start = time.monotonic()
+
+    def record(self, latency, now=None, cpu=None):
+        """ record latency and cpu seconds of a completed task and adjust limit at the end of a window
+        """
+        self._latencies.append(latency)
+        if cpu:
+            self._cpu += cpu
+        if len(self._latencies) >= (self._window or self.limit):
+            self._adjust(time.monotonic() if now is None else now)
+
+    def _adjust(self, now):
+        """ adjust limit using throughput and latency measured over the window
+        """
+        elapsed = max(now - self._window_start, 1e-6)
+        throughput = len(self._latencies) / elapsed
+        latency = median(self._latencies)
+        # share of the cpus used by the tasks completed in the window
+        load = self._cpu / (elapsed * CONCURRENCY)
+        if load > CPU_SATURATION:
+            self._direction = -1
+        elif self._previous:
+            previous_throughput, previous_latency = self._previous
+            if throughput < previous_throughput * .95:
+                self._direction = -self._direction
+            elif throughput < previous_throughput * 1.05 and latency > previous_latency * 1.5:
+                self._direction = -1
+        step = max(1, self.limit // 4)
+        self.limit = min(max(self.limit + self._direction * step, self._minimum), self.maximum)
+        self.throughput = throughput
+        self._previous = (throughput, latency)
+        self._latencies = []
+        self._cpu = 0.
+        self._window_start = now
+
+
+class GrowingPool:
+    """ pools of processes started lazily as the number of tasks in flight grows
+        a task runs in a pool with an idle process, when every process is busy a pool
+        with enough processes for the current limit of tasks in flight, or for the tasks
+        remaining when there are fewer, is started
+    """
+
+    def __init__(self):
+        """ constructor
+        """
+        # pool, number of processes and number of tasks running
+        self._pools = []
+        self._running = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        for pool, _, _ in self._pools:
+            pool.terminate()
+
+    @property
+    def processes(self):
+        """ return number of processes started
+        """
+        return sum(size for _, size, _ in self._pools)
+
+    def apply_async(self, function, args, limit, remaining=None):
+        """ run function with args in a pool with an idle process and return its result
+            a new pool does not start more processes than the remaining number of tasks
+        """
+        for entry in self._pools:
+            if entry[2] < entry[1]:
+                break
+        else:
+            size = limit - self.processes
+            if remaining is not None:
+                size = min(size, remaining)
+            size = max(size, 1)
+            entry = [Pool(size), size, 0]
+            self._pools.append(entry)
+        entry[2] += 1
+        result = entry[0].apply_async(function, args)
+        self._running[id(result)] = entry
+        return result
+
+    def release(self, result):
+        """ mark process that ran result as idle
+        """
+        self._running.pop(id(result))[2] -= 1
+
+
+class AdaptiveResult:  # pragma: no cover
+    """ results of an adaptive pool_map with the same interface as multiprocessing.pool.AsyncResult
+    """
+
+    def __init__(self, results, error=None):
+        self._results = results
+        self._error = error
+
+    def ready(self):
+        return True
+
+    def successful(self):
+        return self._error is None
+
+    def wait(self, timeout=None):
+        pass
+
+    def get(self, timeout=None):
+        if self._error is not None:
+            raise self._error
+        return self._results
+
+
+QueueManager.register('LinesQueue', LinesQueue)
+QueueManager.register('BoundedLinesQueue', BoundedLinesQueue)
+
+
+def _validate_processes(processes, adaptive=False):  # pragma: no cover
+    """ return processes defaulting to available cores and validate it
+        processes may exceed available cores when adaptive
+    """
+    if not processes:
+        processes = CONCURRENCY
+    if adaptive:
+        if processes <= 0:
+            raise ValueError('processes must be greater than 0')
+    elif not (0 < processes <= CONCURRENCY):
+        raise ValueError(
+            f'processes must be greater than 0 and less than equal to available cores {CONCURRENCY}, '
+            'use adaptive to oversubscribe')
+    return processes
+
+
+def _validate_overflow(overflow):  # pragma: no cover
+    """ validate overflow is a supported policy
+    """
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f'overflow must be one of {OVERFLOW_POLICIES}')
+
+
+def pool_map(function, iterable, context=None, print_status=True, processes=None,
+             maxsize=None, overflow='block', queue_stats=None, adaptive=False,
+             max_processes=None, tracer=None):  # pragma: no cover
     """ multiprocessing helper function to write messages from Pool of processes to terminal
         context is a subclass of list2term.Lines
+        maxsize bounds the number of pending messages using the overflow policy
+        queue_stats if set is a dict updated with dropped and merged message counts
+        adaptive starts processes tasks in flight and adjusts the number of tasks in flight
+            up to max_processes using AdaptiveConcurrency, processes are started as the number
+            of tasks in flight grows, a summary row showing concurrency and throughput is added
+            to context while the tasks run
+        tracer if set is a list2term.tracing.LatencyTracer recording message latency and task duration
         returns multiprocessing.pool.AsyncResult
     """
-    if not processes:
-        processes = CONCURRENCY
-    if not (0 < processes <= CONCURRENCY):
-        raise ValueError(f'processes must be greater than 0 and less than equal to available cores {CONCURRENCY}')
-    QueueManager.register('LinesQueue', LinesQueue)
+    processes = _validate_processes(processes, adaptive=adaptive)
+    _validate_overflow(overflow)
+    if not context:
+        context = nullcontext()
     with QueueManager() as manager:
-        lines_queue = manager.LinesQueue(ctx=get_context())
-        with Pool(processes) as pool:
-            # add lines_queue to each process arguments list
-            # the function should write status messages to the queue
-            process_data = [item + (lines_queue,) for item in iterable]
-            # start process pool asynchronously
-            results = pool.starmap_async(function, process_data)
-            if not context:
-                context = nullcontext()
-            with context as lines:
-                while True:
-                    try:
-                        item = lines_queue.get(timeout=.1)
-                        if lines:
-                            lines.write(item)
-                        else:
-                            if print_status:
-                                print(item, file=sys.stderr)
-                    except Empty:
-                        if results.ready():
-                            break
+        lines_queue = _create_queue(manager, maxsize=maxsize, overflow=overflow)
+        if adaptive:
+            controller = AdaptiveConcurrency(processes, maximum=max_processes)
+            with GrowingPool() as pool:
+                with context as lines:
+                    results = _adaptive_map(
+                        pool, function, iterable, lines_queue, controller, lines, print_status, tracer=tracer)
+        else:
+            with Pool(processes) as pool:
+                # add lines_queue to each process arguments list
+                # the function should write status messages to the queue
+                function, process_data = _get_process_data(function, iterable, lines_queue, tracer=tracer)
+                # start process pool asynchronously
+                results = pool.starmap_async(function, process_data)
+                with context as lines:
+                    _drain(lines_queue, results, lines, print_status, tracer=tracer)
+        if maxsize and queue_stats is not None:
+            queue_stats.update(lines_queue.stats())
     return results
+
+
+def _adaptive_map(pool, function, iterable, lines_queue, controller, lines, print_status,
+                  tracer=None):
+    """ apply function to each tuple of arguments in iterable keeping at most controller.limit
+        tasks in flight in GrowingPool pool, write messages to lines and show concurrency in
+        a summary row that is removed when all tasks complete
+        returns AdaptiveResult
+    """
+    function, process_data = _get_process_data(function, iterable, lines_queue, tracer=tracer)
+    function = CpuTimedTask(function)
+    pending = deque(process_data)
+    results = [None] * len(pending)
+    in_flight = {}
+    error = None
+    summary_index = _add_summary_line(lines) if lines is not None else None
+    position = 0
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < controller.limit and error is None:
+                result = pool.apply_async(function, pending.popleft(), controller.limit, len(pending) + 1)
+                in_flight[position] = (result, time.monotonic())
+                position += 1
+            try:
+                _handle_item(lines_queue.get(timeout=.05), lines, print_status, tracer)
+            except Empty:
+                pass
+            for index, (result, started) in list(in_flight.items()):
+                if result.ready():
+                    del in_flight[index]
+                    pool.release(result)
+                    latency = time.monotonic() - started
+                    try:
+                        results[index], cpu = result.get()
+                    except Exception as exception:
+                        controller.record(latency)
+                        error = error or exception
+                        pending.clear()
+                    else:
+                        controller.record(latency, cpu=cpu)
+            if summary_index is not None:
+                summary = (f'concurrency: {len(in_flight)}/{controller.limit} '
+                           f'throughput: {controller.throughput:.1f} tasks/s '
+                           f'completed: {position - len(in_flight)}/{len(results)}')
+                if lines[summary_index] != summary:
+                    lines[summary_index] = summary
+    finally:
+        if summary_index is not None:
+            _remove_summary_line(lines, summary_index)
+    # write messages remaining on queue
+    while True:
+        try:
+            _handle_item(lines_queue.get(block=False), lines, print_status, tracer)
+        except Empty:
+            break
+    return AdaptiveResult(results, error=error)
+
+
+def _add_summary_line(lines):
+    """ return index of the summary line added to lines
+        lines without lookup get a line appended that messages are not routed to
+    """
+    try:
+        return lines.add_line(SUMMARY_ID, label=SUMMARY_ID)
+    except ValueError:
+        lines.append('')
+        return len(lines) - 1
+
+
+def _remove_summary_line(lines, summary_index):
+    """ remove summary line added to lines
+    """
+    if lines.index_of(SUMMARY_ID) is not None:
+        lines.remove_line(SUMMARY_ID)
+    else:
+        del lines[summary_index]
+
+
+class LinesPool:
+    """ long lived Pool of processes and message queue reused across many map calls
+        context is a subclass of list2term.Lines kept open for the life of the pool
+        start_method is one of fork, forkserver or spawn, defaults to the platform default
+        initializer and initargs are called by each worker process when it starts
+        tracer if set is a list2term.tracing.LatencyTracer recording message latency and task duration
+    """
+
+    def __init__(self, processes=None, context=None, print_status=True, initializer=None, initargs=(),
+                 start_method=None, maxsize=None, overflow='block', tracer=None):
+        """ constructor
+        """
+        logger.debug('executing LinesPool constructor')
+        self._processes = _validate_processes(processes)
+        _validate_overflow(overflow)
+        self._context = context
+        self._print_status = print_status
+        self._initializer = initializer
+        self._initargs = initargs
+        self._mp_context = get_context(start_method)
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._tracer = tracer
+        self._manager = None
+        self._queue = None
+        self._pool = None
+        self._lines = None
+
+    def __enter__(self):
+        """ on entry start manager, pool of processes and enter lines context
+        """
+        self._manager = QueueManager(ctx=self._mp_context)
+        self._manager.start()
+        try:
+            self._queue = _create_queue(self._manager, maxsize=self._maxsize, overflow=self._overflow)
+            self._pool = self._mp_context.Pool(self._processes, self._initializer, self._initargs)
+            if self._context:
+                self._lines = self._context.__enter__()
+        except BaseException:
+            # do not leave processes running when the pool can not be entered
+            if self._pool:
+                self._pool.terminate()
+                self._pool = None
+            self._manager.shutdown()
+            raise
+        return self
+
+    def __exit__(self, *args):
+        """ on exit exit lines context and stop pool of processes and manager
+            queued tasks are discarded when exiting with an exception
+        """
+        try:
+            if self._context:
+                self._context.__exit__(*args)
+        finally:
+            if args and args[0] is not None:
+                self._pool.terminate()
+            else:
+                self._pool.close()
+            self._pool.join()
+            self._manager.shutdown()
+            self._pool = None
+            self._lines = None
+
+    def map(self, function, iterable, context=None):
+        """ run function for each tuple of arguments in iterable writing messages to terminal
+            the function is passed the message queue as its last argument
+            context if set is entered for this call only in place of the pool context
+            returns multiprocessing.pool.AsyncResult
+        """
+        if not self._pool:
+            raise RuntimeError('LinesPool must be used as a context manager')
+        function, process_data = _get_process_data(function, iterable, self._queue, tracer=self._tracer)
+        results = self._pool.starmap_async(function, process_data)
+        if context:
+            with context as lines:
+                _drain(self._queue, results, lines, self._print_status, tracer=self._tracer)
+        else:
+            _drain(self._queue, results, self._lines, self._print_status, tracer=self._tracer)
+        return results
+
+    def queue_stats(self):
+        """ return dropped and merged message counts when the queue is bounded
+        """
+        return self._queue.stats() if self._maxsize else {}
@@ -0,0 +1,217 @@
+import os
+import stat
+import json
+import socket
+import logging
+import threading
+import socketserver
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 64
+FLUSH_INTERVAL = .05
+
+
+def _is_unix_address(address):
+    """ return True if address refers to a unix domain socket path
+    """
+    return isinstance(address, (str, bytes, os.PathLike))
+
+
+def _is_socket(path):
+    """ return True if path exists and is a socket
+    """
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return False
+
+
+def _remove_stale_socket(path):
+    """ remove socket left at path by a previous server, any other file is kept
+    """
+    if _is_socket(path):
+        os.unlink(path)
+    elif os.path.lexists(path):
+        raise FileExistsError(f'{path} exists and is not a socket')
+
+
+class _LinesHandler(socketserver.StreamRequestHandler):
+    """ apply newline delimited updates received from a client to the server lines
+    """
+
+    def handle(self):
+        lines = self.server.lines
+        for raw in self.rfile:
+            text = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+            if text:
+                LinesServer.apply(lines, text)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LinesServer:
+    """ own a Lines instance and update it from messages received over a socket
+        address is a path for a unix domain socket or a (host, port) tuple for tcp
+        each message is a line of text either:
+            "{line_id}->{message}" routed with Lines.write
+            a json object with "message" and one of "line_id" or "index"
+    """
+
+    def __init__(self, lines, address):
+        """ constructor
+        """
+        logger.debug('executing LinesServer constructor')
+        self.lines = lines
+        self.address = address
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        """ on entry enter lines context and start serving
+        """
+        self.lines.__enter__()
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """ on exit stop serving and exit lines context
+        """
+        self.stop()
+        self.lines.__exit__(*args)
+
+    def start(self):
+        """ bind the socket and serve clients from a background thread
+        """
+        if _is_unix_address(self.address):
+            _remove_stale_socket(self.address)
+            server = _UnixServer(self.address, _LinesHandler)
+        else:
+            server = _TCPServer(self.address, _LinesHandler)
+        server.lines = self.lines
+        self._server = server
+        # for tcp the bound address includes the port assigned when port 0 is requested
+        self.address = server.server_address
+        self._thread = threading.Thread(target=server.serve_forever, name='lines-server', daemon=True)
+        self._thread.start()
+        logger.debug('lines server listening on %s', self.address)
+
+    def stop(self):
+        """ stop serving and release the socket
+        """
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        if _is_unix_address(self.address) and _is_socket(self.address):
+            os.unlink(self.address)
+        self._server = None
+        self._thread = None
+
+    @staticmethod
+    def apply(lines, text):
+        """ apply a single message to lines
+        """
+        if text.startswith('{'):
+            try:
+                update = json.loads(text)
+            except ValueError:
+                update = None
+            if isinstance(update, dict):
+                message = update.get('message', '')
+                if 'index' in update:
+                    index = update['index']
+                    if isinstance(index, int) and -len(lines) <= index < len(lines):
+                        lines[index] = message
+                    else:
+                        logger.warning('ignoring update for invalid index %s', index)
+                else:
+                    lines.write(message, line_id=update.get('line_id'))
+                return
+        lines.write(text)
+
+
+class LinesClient:
+    """ lightweight writer that batches messages to a LinesServer
+        messages are flushed when batch_size messages are buffered or
+        flush_interval seconds have passed since the last flush
+    """
+
+    def __init__(self, address, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        """ constructor
+        """
+        family = socket.AF_UNIX if _is_unix_address(address) else socket.AF_INET
+        self._socket = socket.socket(family, socket.SOCK_STREAM)
+        self._socket.connect(address)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __setitem__(self, index, item):
+        """ set the line at index on the server
+        """
+        self._send(json.dumps({'index': index, 'message': str(item)}))
+
+    def write(self, item, line_id=None):
+        """ send item to the server, see Lines.write
+        """
+        item = str(item)
+        if line_id is not None or '\n' in item or item.startswith('{'):
+            self._send(json.dumps({'line_id': line_id, 'message': item}))
+        else:
+            self._send(item)
+
+    def flush(self):
+        """ send all buffered messages
+        """
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """ flush buffered messages and close the connection
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            self._flush()
+            self._socket.close()
+
+    def _send(self, text):
+        """ buffer text and flush if batch is full otherwise schedule a flush
+        """
+        with self._lock:
+            self._buffer.append(text)
+            if len(self._buffer) >= self._batch_size:
+                self._flush()
+            elif not self._timer:
+                self._timer = threading.Timer(self._flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush(self):
+        """ write buffered messages to the socket in a single call
+        """
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            payload = ''.join(f'{text}\n' for text in self._buffer)
+            self._buffer.clear()
+            self._socket.sendall(payload.encode('utf-8'))
@@ -0,0 +1,46 @@
+import threading
+
+
+class ShardedUpdates:
+    """ latest pending item of each index split across shards by index
+        each shard is guarded by its own lock so threads updating distinct lines
+        rarely contend, the render owner takes the pending items of all shards
+        once per frame
+    """
+
+    def __init__(self, count):
+        """ constructor
+        """
+        if count <= 0:
+            raise ValueError('count must be greater than 0')
+        self._count = count
+        self._locks = [threading.Lock() for _ in range(count)]
+        self._pending = [{} for _ in range(count)]
+
+    def __len__(self):
+        return sum(len(pending) for pending in self._pending)
+
+    def put(self, index, item):
+        """ set pending item of index replacing any item not yet taken
+        """
+        shard = index % self._count
+        with self._locks[shard]:
+            self._pending[shard][index] = item
+
+    def get(self, index, default=None):
+        """ return pending item of index or default when there is none
+        """
+        return self._pending[index % self._count].get(index, default)
+
+    def take(self):
+        """ return pending items of all shards by index and reset the shards
+        """
+        taken = {}
+        for shard, lock in enumerate(self._locks):
+            with lock:
+                pending = self._pending[shard]
+                if not pending:
+                    continue
+                self._pending[shard] = {}
+            taken.update(pending)
+        return taken
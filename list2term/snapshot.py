@@ -0,0 +1,128 @@
+import sys
+import mmap
+import time
+import struct
+import logging
+import argparse
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'L2TSNAP1'
+# magic, generation, capacity of rows, width of a row in bytes, count of rows
+HEADER = struct.Struct('<8sQIII')
+HEADER_SIZE = 32
+GENERATION_OFFSET = 8
+COUNT_OFFSET = 24
+LENGTH = struct.Struct('<H')
+WIDTH = 256
+RETRIES = 1000
+
+
+class SnapshotWriter:
+    """ publish rows of text to a fixed layout memory mapped file
+        the file holds a header followed by rows slots of width bytes, each slot
+        holds the length of the utf-8 encoded row followed by the row
+        the generation in the header is odd while rows are written and even once they
+        are consistent, readers retry until they read the same even generation before
+        and after copying the rows
+    """
+
+    def __init__(self, path, rows, width=WIDTH):
+        """ constructor
+        """
+        logger.debug('executing SnapshotWriter constructor')
+        if rows <= 0:
+            raise ValueError('rows must be greater than 0')
+        if not (LENGTH.size < width <= LENGTH.size + 0xFFFF):
+            raise ValueError(f'width must be greater than {LENGTH.size} and at most {LENGTH.size + 0xFFFF}')
+        self.path = path
+        self.rows = rows
+        self.width = width
+        self._generation = 0
+        size = HEADER_SIZE + rows * width
+        with open(path, 'wb') as stream:
+            stream.truncate(size)
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), size)
+        HEADER.pack_into(self._map, 0, MAGIC, self._generation, rows, width, 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def begin(self):
+        """ mark rows as being written
+        """
+        self._generation += 1
+        struct.pack_into('<Q', self._map, GENERATION_OFFSET, self._generation)
+
+    def end(self):
+        """ mark rows as consistent
+        """
+        self._generation += 1
+        struct.pack_into('<Q', self._map, GENERATION_OFFSET, self._generation)
+
+    def set_count(self, count):
+        """ set number of rows published, rows beyond capacity are not published
+        """
+        struct.pack_into('<I', self._map, COUNT_OFFSET, min(count, self.rows))
+
+    def write_row(self, row, text):
+        """ write text to row truncated to the row width
+        """
+        if row >= self.rows:
+            return
+        encoded = text.encode('utf-8', errors='replace')[:self.width - LENGTH.size]
+        offset = HEADER_SIZE + row * self.width
+        LENGTH.pack_into(self._map, offset, len(encoded))
+        self._map[offset + LENGTH.size:offset + LENGTH.size + len(encoded)] = encoded
+
+    def close(self):
+        """ close memory map and file
+        """
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+
+def read_snapshot(path):
+    """ return generation and list of rows of a consistent snapshot published to path
+    """
+    with open(path, 'rb') as stream:
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+            for _ in range(RETRIES):
+                magic, generation, rows, width, count = HEADER.unpack_from(snapshot, 0)
+                if magic != MAGIC:
+                    raise ValueError(f'{path} is not a list2term snapshot')
+                if generation % 2:
+                    time.sleep(0)
+                    continue
+                data = snapshot[HEADER_SIZE:HEADER_SIZE + count * width]
+                if HEADER.unpack_from(snapshot, 0)[1] != generation:
+                    continue
+                result = []
+                for row in range(count):
+                    offset = row * width
+                    length = LENGTH.unpack_from(data, offset)[0]
+                    start = offset + LENGTH.size
+                    result.append(data[start:start + length].decode('utf-8', errors='ignore'))
+                return generation, result
+    raise RuntimeError(f'unable to read a consistent snapshot from {path}')
+
+
+def main(argv=None):  # pragma: no cover
+    """ print rows of a snapshot
+    """
+    parser = argparse.ArgumentParser(prog='python -m list2term.snapshot', description='print a list2term snapshot')
+    parser.add_argument('path', help='path of snapshot')
+    args = parser.parse_args(argv)
+    _, rows = read_snapshot(args.path)
+    for row in rows:
+        print(row)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
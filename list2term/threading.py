@@ -0,0 +1,70 @@
+import os
+import logging
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+from contextlib import nullcontext
+from list2term import Lines
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def report(item):
+    """ update the line bound to the current thread_map worker thread with item
+    """
+    try:
+        lines = _local.lines
+        index = _local.index
+    except AttributeError:
+        raise RuntimeError('report must be called from a thread_map worker thread') from None
+    if lines[index] != item:
+        lines[index] = item
+
+
+def _bind(lines, counter, lock):
+    """ bind the starting worker thread to the next line
+    """
+    with lock:
+        index = next(counter)
+    _local.lines = lines
+    _local.index = index
+
+
+def thread_map(function, iterable, max_workers=None, lines=None):
+    """ threading helper function to run function for each item in iterable with a pool of
+        max_workers threads, each worker thread is bound to a line when it starts and calls
+        report(message) to update it
+        lines defaults to a Lines of size max_workers that is displayed while iterating
+        yields results as they complete
+    """
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    if max_workers <= 0:
+        raise ValueError('max_workers must be greater than 0')
+    if lines is None:
+        lines = Lines(size=max_workers)
+        context = lines
+    else:
+        if len(lines) < max_workers:
+            raise ValueError('size of lines must be greater than or equal to max_workers')
+        context = nullcontext(lines)
+    items = iter(iterable)
+    with context:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='thread_map',
+                                initializer=_bind, initargs=(lines, itertools.count(), threading.Lock())) as executor:
+            # submit items lazily keeping a bounded number of tasks pending
+            futures = {executor.submit(function, item) for item in itertools.islice(items, max_workers * 2)}
+            try:
+                while futures:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for item in itertools.islice(items, 1):
+                            futures.add(executor.submit(function, item))
+                        yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
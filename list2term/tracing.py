@@ -0,0 +1,153 @@
+import os
+import time
+import random
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+TRACE = '__list2term_trace__'
+TASK = '__list2term_task__'
+RESERVOIR_SIZE = 10_000
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """ fixed size reservoir sample of values reporting count, percentiles and maximum
+    """
+
+    def __init__(self, size=RESERVOIR_SIZE):
+        """ constructor
+        """
+        self.count = 0
+        self.maximum = 0.
+        self._size = size
+        self._samples = []
+
+    def add(self, value):
+        """ add value to histogram
+        """
+        self.count += 1
+        if value > self.maximum:
+            self.maximum = value
+        if len(self._samples) < self._size:
+            self._samples.append(value)
+        else:
+            # reservoir sampling keeps every value with equal probability
+            index = random.randrange(self.count)  # nosec B311
+            if index < self._size:
+                self._samples[index] = value
+
+    def percentile(self, percent):
+        """ return value at percent of sampled values
+        """
+        if not self._samples:
+            return 0.
+        samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def summary(self):
+        """ return dict of count, percentiles and maximum
+        """
+        summary = {'count': self.count}
+        for percent in PERCENTILES:
+            summary[f'p{percent}'] = self.percentile(percent)
+        summary['max'] = self.maximum
+        return summary
+
+
+class TracedWriter:
+    """ worker side writer that timestamps messages before writing them to the queue
+    """
+
+    def __init__(self, queue):
+        """ constructor
+        """
+        self._queue = queue
+
+    def write(self, item):
+        """ write item to queue with the worker process id and time written
+        """
+        self._queue.write((TRACE, os.getpid(), time.time(), item))
+
+    def task(self, started, finished):
+        """ write start and finish time of a task to queue
+        """
+        self._queue.write((TASK, os.getpid(), started, finished))
+
+
+class TimedTask:
+    """ wrapper of a worker function that reports its duration through the TracedWriter
+        passed as its last argument
+    """
+
+    def __init__(self, function):
+        """ constructor
+        """
+        self._function = function
+
+    def __call__(self, *args):
+        started = time.time()
+        try:
+            return self._function(*args)
+        finally:
+            args[-1].task(started, time.time())
+
+
+class LatencyTracer:
+    """ record latency of traced messages per worker process:
+            transport: written by worker to read from queue by parent
+            render: read from queue to written to lines
+            total: written by worker to written to lines
+        and the duration of each task
+    """
+
+    def __init__(self):
+        """ constructor
+        """
+        self.transport = defaultdict(Histogram)
+        self.render = defaultdict(Histogram)
+        self.total = defaultdict(Histogram)
+        self.tasks = defaultdict(Histogram)
+
+    def handle(self, item, write):
+        """ unwrap a traced item, write its message with write and record latencies
+            items that are not traced are written as is
+        """
+        if isinstance(item, tuple) and len(item) == 4:
+            kind, worker, first, second = item
+            if kind == TRACE:
+                dequeued = time.time()
+                write(second)
+                rendered = time.time()
+                self.transport[worker].add(dequeued - first)
+                self.render[worker].add(rendered - dequeued)
+                self.total[worker].add(rendered - first)
+                return
+            if kind == TASK:
+                self.tasks[worker].add(second - first)
+                return
+        write(item)
+
+    def summary(self):
+        """ return dict of histogram summaries by stage and worker
+        """
+        return {
+            stage: {worker: histogram.summary() for worker, histogram in histograms.items()}
+            for stage, histograms in (
+                ('transport', self.transport),
+                ('render', self.render),
+                ('total', self.total),
+                ('tasks', self.tasks))
+        }
+
+    def report(self):
+        """ return summary formatted as a table with times in milliseconds
+        """
+        rows = [f"{'stage':<10} {'worker':>8} {'count':>7} " + ' '.join(f"{f'p{p}':>9}" for p in PERCENTILES) + f" {'max':>9}"]
+        for stage, workers in self.summary().items():
+            for worker, summary in sorted(workers.items()):
+                values = ' '.join(f"{summary[f'p{p}'] * 1000:>9.2f}" for p in PERCENTILES)
+                rows.append(f"{stage:<10} {worker:>8} {summary['count']:>7} {values} {summary['max'] * 1000:>9.2f}")
+        return '\n'.join(rows)
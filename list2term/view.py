@@ -0,0 +1,69 @@
+from bisect import bisect_left
+
+
+def _no_key(value):
+    return 0
+
+
+class SortedView:
+    """ display order of data indices sorted by key of their value
+        the order is maintained incrementally, an updated index is moved to its new
+        position with a bisect instead of sorting all indices
+        ties are ordered by index, indices of values that are not visible are excluded
+    """
+
+    def __init__(self, key=None, visible=None):
+        """ constructor
+        """
+        self._key = key or _no_key
+        self._visible = visible
+        # sorted list of (key, index) and the entry of each index
+        self._entries = []
+        self._entry_of = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def rebuild(self, data):
+        """ sort all indices of data
+        """
+        visible = self._visible
+        self._entry_of = {
+            index: (self._key(value), index)
+            for index, value in enumerate(data)
+            if visible is None or visible(value)
+        }
+        self._entries = sorted(self._entry_of.values())
+
+    def update(self, index, value):
+        """ move index to the position of value and return its old and new positions
+            a position is None when the index is not visible
+        """
+        old = None
+        old_entry = self._entry_of.pop(index, None)
+        if old_entry is not None:
+            old = bisect_left(self._entries, old_entry)
+            del self._entries[old]
+        new = None
+        if self._visible is None or self._visible(value):
+            entry = (self._key(value), index)
+            new = bisect_left(self._entries, entry)
+            self._entries.insert(new, entry)
+            self._entry_of[index] = entry
+        return old, new
+
+    def position_of(self, index):
+        """ return position of data index or None when not visible
+        """
+        entry = self._entry_of.get(index)
+        return None if entry is None else bisect_left(self._entries, entry)
+
+    def index_at(self, position):
+        """ return data index displayed at position
+        """
+        return self._entries[position][1]
+
+    def indices(self):
+        """ return data indices in display order
+        """
+        return [entry[1] for entry in self._entries]
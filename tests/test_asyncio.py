@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+from mock import patch
+from list2term import Lines
+from list2term.asyncio import async_map
+from list2term.asyncio import LineWriter
+
+
+class TestAsyncMap(unittest.TestCase):
+
+    def test__async_map_Should_RaiseValueError_When_LinesLessThanConcurrency(self, *patches):
+        with self.assertRaises(ValueError):
+            asyncio.run(async_map(None, [], concurrency=3, lines=Lines(size=2)))
+
+    def test__async_map_Should_RaiseValueError_When_InvalidConcurrency(self, *patches):
+        with self.assertRaises(ValueError):
+            asyncio.run(async_map(None, [], concurrency=0))
+
+    def test__async_map_Should_ReturnResultsInOrderAndLimitConcurrency_When_Called(self, *patches):
+        running = []
+        peak = []
+        used = set()
+
+        async def work(number, delay, logger):
+            running.append(number)
+            peak.append(len(running))
+            used.add(logger._index)
+            logger.write(f'processing {number}')
+            await asyncio.sleep(delay)
+            running.remove(number)
+            return number * 2
+
+        def items():
+            for number in range(20):
+                yield number, (20 - number) / 1000
+
+        lines = Lines(size=3)
+        results = asyncio.run(async_map(work, items(), concurrency=3, lines=lines))
+        self.assertEqual(results, [number * 2 for number in range(20)])
+        self.assertEqual(max(peak), 3)
+        self.assertEqual(used, {0, 1, 2})
+        self.assertTrue(all(line.startswith('processing') for line in lines))
+
+    def test__async_map_Should_RunInExecutor_When_Blocking(self, *patches):
+
+        def work(number, logger):
+            logger.write(number)
+            return number + 1
+
+        lines = Lines(size=2)
+        results = asyncio.run(async_map(work, range(5), concurrency=2, lines=lines, blocking=True))
+        self.assertEqual(results, [1, 2, 3, 4, 5])
+
+    def test__async_map_Should_RaiseException_When_TaskRaises(self, *patches):
+
+        async def work(number, logger):
+            if number == 2:
+                raise KeyError(number)
+            await asyncio.sleep(.01)
+
+        with self.assertRaises(KeyError):
+            asyncio.run(async_map(work, range(10), concurrency=2, print_status=False))
+
+    @patch('builtins.print')
+    def test__write_Should_Print_When_NoLines(self, print_patch, *patches):
+        LineWriter(None, 0).write('hello')
+        self.assertEqual(print_patch.mock_calls[0].args, ('hello',))
+        LineWriter(None, 0, print_status=False).write('hello')
+        self.assertEqual(len(print_patch.mock_calls), 1)
@@ -0,0 +1,95 @@
+import unittest
+from mock import patch
+from mock import call
+from list2term import Lines
+from list2term.cells import Cell
+from list2term.cells import Spinner
+from list2term.cells import Elapsed
+from list2term.cells import Updated
+
+
+class TestCells(unittest.TestCase):
+
+    @patch('list2term.cells.time.monotonic', return_value=100)
+    def test__render_Should_AdvanceSpinner_When_IntervalElapsed(self, *patches):
+        spinner = Spinner('working', interval=.5)
+        self.assertEqual(spinner.render(100), '| working')
+        self.assertEqual(spinner.render(100.4), '| working')
+        self.assertEqual(spinner.render(100.5), '/ working')
+        self.assertEqual(spinner.render(102), '| working')
+
+    @patch('list2term.cells.time.monotonic', return_value=100)
+    def test__render_Should_ReturnElapsedTime_When_Elapsed(self, *patches):
+        self.assertEqual(Elapsed('running').render(165.5), 'running 0:01:05')
+
+    @patch('list2term.cells.time.monotonic', return_value=100)
+    def test__render_Should_ReturnAge_When_Updated(self, *patches):
+        self.assertEqual(Updated('3 found').render(107.9), '3 found (updated 7s ago)')
+
+    @patch('list2term.cells.time.monotonic')
+    def test__str_Should_RenderNow_When_Called(self, monotonic_patch, *patches):
+        monotonic_patch.return_value = 100
+        elapsed = Elapsed('running')
+        monotonic_patch.return_value = 102
+        self.assertEqual(str(elapsed), 'running 0:00:02')
+
+    def test__render_Should_RaiseNotImplementedError_When_Cell(self, *patches):
+        with self.assertRaises(NotImplementedError):
+            Cell('text').render(0)
+
+    def test__eq_Should_CompareTypeAndText_When_Called(self, *patches):
+        self.assertEqual(Spinner('a'), Spinner('a'))
+        self.assertNotEqual(Spinner('a'), Spinner('b'))
+        self.assertNotEqual(Spinner('a'), Elapsed('a'))
+        self.assertNotEqual(Spinner('a'), 'a')
+
+
+class TestLinesCells(unittest.TestCase):
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    @patch('list2term.list2term.time.monotonic', return_value=100)
+    def test__animate_cells_Should_PrintChangedLines_When_TextChanges(self, monotonic_patch, print_line_patch, *patches):
+        lines = Lines(data=['a', Elapsed('b'), Spinner('c', interval=5)])
+        self.assertEqual(list(lines._cells), [1, 2])
+        monotonic_patch.return_value = 100.5
+        lines._animate_cells()
+        self.assertEqual(print_line_patch.mock_calls[-2:], [call(1), call(2)])
+        print_line_patch.reset_mock()
+        lines._animate_cells()
+        print_line_patch.assert_not_called()
+        monotonic_patch.return_value = 101
+        lines._animate_cells()
+        print_line_patch.assert_called_once_with(1)
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__setitem_Should_TrackCells_When_CellsSetAndRemoved(self, *patches):
+        lines = Lines(size=3)
+        lines[-1] = Spinner('x')
+        lines.append(Elapsed('y'))
+        self.assertEqual(list(lines._cells), [2, 3])
+        lines[2] = 'done'
+        self.assertEqual(list(lines._cells), [3])
+        del lines[0]
+        self.assertEqual(list(lines._cells), [2])
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__write_Should_NotRestartCell_When_SameMessageWritten(self, *patches):
+        lines = Lines(lookup=['w1', 'w2'], animate=Spinner)
+        lines.write('w1->working')
+        cell = lines[0]
+        self.assertIsInstance(cell, Spinner)
+        lines.write('w1->working')
+        self.assertIs(lines[0], cell)
+        lines.write('w1->done')
+        self.assertEqual(lines[0].text, 'done')
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    def test__enter_Should_StartClock_When_CellSet(self, *patches):
+        with Lines(size=2) as lines:
+            self.assertIsNone(lines._clock)
+            lines[0] = Spinner('x')
+            self.assertTrue(lines._clock.is_alive())
+        self.assertIsNone(lines._clock)
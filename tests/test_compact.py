@@ -0,0 +1,78 @@
+import unittest
+from mock import patch
+from list2term import Lines
+from list2term.cells import Spinner
+from list2term.compact import CompactRows
+from list2term.compact import to_text
+
+
+class TestCompactRows(unittest.TestCase):
+
+    def test__to_text_Should_ReturnText_When_Called(self, *patches):
+        self.assertEqual(to_text(None), '')
+        self.assertEqual(to_text('a'), 'a')
+        self.assertEqual(to_text(['a', None, 1]), 'a1')
+        self.assertEqual(to_text(3.5), '3.5')
+
+    def test__init_Should_StoreItemsAsText_When_Called(self, *patches):
+        rows = CompactRows(['a', 1, None, 'héllo'])
+        self.assertEqual(list(rows), ['a', '1', '', 'héllo'])
+        self.assertEqual(rows, ['a', '1', '', 'héllo'])
+        self.assertEqual(repr(rows), "['a', '1', '', 'héllo']")
+        self.assertEqual(rows[-1], 'héllo')
+
+    def test__setitem_Should_ShareText_When_TextRecentlyStored(self, *patches):
+        rows = CompactRows(['pending'] * 100)
+        self.assertEqual(rows.arena_size(), len('pending'))
+        rows[5] = 'complete'
+        rows[6] = 'complete'
+        self.assertEqual(rows.arena_size(), len('pendingcomplete'))
+        self.assertEqual(rows[4:7], ['pending', 'complete', 'complete'])
+
+    def test__setitem_Should_SetSlice_When_IndexIsSlice(self, *patches):
+        rows = CompactRows(['a', 'b', 'c'])
+        rows[1:] = ['x', 'y', 'z']
+        self.assertEqual(list(rows), ['a', 'x', 'y', 'z'])
+        with self.assertRaises(ValueError):
+            rows[::2] = ['q']
+        self.assertEqual(list(rows), ['a', 'x', 'y', 'z'])
+
+    def test__delitem_Should_RemoveRows_When_Called(self, *patches):
+        rows = CompactRows(['a', 'b', 'c', 'd'])
+        del rows[0]
+        del rows[1:]
+        rows.insert(0, 'x')
+        rows.append('y')
+        self.assertEqual(list(rows), ['x', 'b', 'y'])
+        rows.clear()
+        self.assertEqual(len(rows), 0)
+        self.assertEqual(rows.arena_size(), 0)
+
+    @patch('list2term.compact.COMPACT_SIZE', 64)
+    def test__compact_Should_DiscardGarbage_When_ArenaDoubled(self, *patches):
+        rows = CompactRows(['state'] * 10 + ['', ''], recent_texts=2)
+        for count in range(100):
+            rows[count % 10] = f'update {count}'
+        rows[10] = 'state'
+        self.assertLess(rows.arena_size(), 200)
+        self.assertEqual(rows[:10], [f'update {count}' for count in range(90, 100)])
+        self.assertEqual(rows[10:], ['state', ''])
+        rows._compact()
+        self.assertEqual(rows[:10], [f'update {count}' for count in range(90, 100)])
+        self.assertEqual(rows[10:], ['state', ''])
+
+
+class TestLinesCompact(unittest.TestCase):
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__lines_Should_StoreText_When_Compact(self, *patches):
+        lines = Lines(data=['a', 'b'], compact=True, use_color=False)
+        self.assertIsInstance(lines.data, CompactRows)
+        lines[0] = ['x', 1]
+        lines.append(2)
+        lines[1] = Spinner('working')
+        self.assertEqual(list(lines), ['x1', '| working', '2'])
+        self.assertEqual(lines._cells, {})
+        lines.pop(0)
+        self.assertEqual(lines._render(1), '1: 2')
@@ -0,0 +1,53 @@
+import os
+import io
+import json
+import tempfile
+import unittest
+from mock import patch
+from list2term import Lines
+from list2term.export import JsonlExporter
+from list2term.export import replay
+
+
+class TestJsonlExporter(unittest.TestCase):
+
+    def test__record_Should_WriteJsonLines_When_Closed(self, *patches):
+        stream = io.StringIO()
+        exporter = JsonlExporter(stream, batch_size=2)
+        exporter.record('set', index=1, key='b', value='hello')
+        exporter.record('set', index=0, key='a', value=['x', 1])
+        exporter.record('clear')
+        exporter.close()
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([record['op'] for record in records], ['set', 'set', 'clear'])
+        self.assertEqual(records[0]['key'], 'b')
+        self.assertEqual(records[1]['value'], ['x', 1])
+        self.assertFalse(stream.closed)
+
+    def test__record_Should_CountDropped_When_QueueFull(self, *patches):
+        stream = io.StringIO()
+        exporter = JsonlExporter(stream, maxsize=1)
+        with patch.object(exporter._queue, 'put_nowait', side_effect=__import__('queue').Full):
+            exporter.record('set', index=0, value='a')
+        self.assertEqual(exporter.dropped, 1)
+        exporter.close()
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    def test__lines_Should_ExportUpdates_When_ExporterSet(self, *patches):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'session.jsonl')
+            with Lines(lookup=['a', 'b'], exporter=JsonlExporter(path)) as lines:
+                lines[1] = 'hello'
+                lines.write('a->world')
+                lines.append('new')
+                lines.pop(0)
+                del lines[0]
+            with open(path) as stream:
+                records = [json.loads(line) for line in stream]
+            self.assertEqual([record['op'] for record in records], ['init', 'set', 'set', 'append', 'pop', 'delete'])
+            self.assertEqual(records[0]['key'], ['a', 'b'])
+            self.assertEqual(records[2]['key'], 'a')
+            self.assertEqual(records[2]['value'], 'world')
+
+            lines = replay(path, speed=0)
+            self.assertEqual(list(lines), ['new'])
@@ -1,9 +1,13 @@
+import logging
+import time
 import unittest
 from mock import patch
 from mock import call
 from mock import Mock
 from list2term import Lines
+from list2term import LinesHandler
 from list2term.list2term import MAX_CHARS
+from list2term.list2term import CLEAR_EOL
 
 
 class TestLines(unittest.TestCase):
@@ -218,6 +222,17 @@ class TestLines(unittest.TestCase):
         with self.assertRaises(ValueError):
             Lines(size=3)
 
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=True)
+    @patch('list2term.list2term.os.get_terminal_size')
+    def test__init_Should_ValidateVisibleRows_When_Collapse(self, get_terminal_size_patch, *patches):
+        get_terminal_size_patch.return_value = Mock(lines=50)
+        lines = Lines(data=['done'] * 190 + [''] * 10, collapse=lambda value: value or None)
+        self.assertEqual(len(lines), 200)
+        with self.assertRaises(ValueError):
+            Lines(data=[''] * 50, collapse=lambda value: value or None)
+        with self.assertRaises(ValueError):
+            Lines(size=51, sort_key=len)
+
     def test__init_Should_RaiseValueError_When_LookupItemsAreNotUnique(self, *patches):
         with self.assertRaises(ValueError):
             Lines(size=3, lookup=['a', 'a', 'a'])
@@ -315,3 +330,251 @@ class TestLines(unittest.TestCase):
         index, message = lines._get_index_message('  el presente (unplugged)  ', line_id='julieta venegas')
         self.assertIsNone(index)
         self.assertEqual(message, '  el presente (unplugged)  ')
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.os.get_terminal_size')
+    @patch('list2term.list2term.sys.stderr')
+    @patch('builtins.print')
+    def test__print_above_Should_InsertRowsAboveLines_When_Tty(self, print_patch, stderr_patch, get_terminal_size_patch, *patches):
+        stderr_patch.isatty.return_value = True
+        get_terminal_size_patch.return_value = Mock(columns=10)
+        lines = Lines(size=3, show_x_axis=True, x_axis='0123')
+        lines._current = 3
+        lines.print_above('first\nsecond line is long')
+        printed = [c.args[0] for c in print_patch.mock_calls]
+        self.assertEqual(printed[0], '\n\n')
+        self.assertTrue(printed[1].endswith('\033[2L'))
+        self.assertEqual(printed[2:], ['first\033[K', 'second li\033[K'])
+        self.assertEqual(lines._current, -1)
+
+    @patch('list2term.list2term.sys.stderr')
+    @patch('builtins.print')
+    def test__print_above_Should_PrintMessage_When_NoTty(self, print_patch, stderr_patch, *patches):
+        stderr_patch.isatty.return_value = False
+        lines = Lines(size=3)
+        lines.print_above('hello')
+        self.assertEqual(print_patch.mock_calls[-1].args, ('hello',))
+        self.assertEqual(lines._current, 0)
+
+    @patch('list2term.Lines.print_above')
+    def test__lines_handler_Should_PrintRecordAbove_When_Emit(self, print_above_patch, *patches):
+        lines = Lines(size=3)
+        handler = LinesHandler(lines)
+        record = logging.LogRecord('test', logging.INFO, __file__, 1, 'hello %s', ('world',), None)
+        handler.emit(record)
+        print_above_patch.assert_called_once_with('hello world')
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=True)
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__set_item_Should_DeferLine_When_BudgetAndClockRunning(self, print_line_patch, *patches):
+        lines = Lines(size=3, max_bytes_per_second=1000)
+        lines._clock = Mock()
+        lines[1] = 'hello world'
+        print_line_patch.assert_not_called()
+        self.assertIn(1, lines._deferred)
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.sys.stderr')
+    @patch('builtins.print')
+    def test__print_deferred_Should_PrintByPriorityWithinBudget_When_Called(self, print_patch, stderr_patch, *patches):
+        lines = Lines(data=['a' * 10, 'b' * 10, 'c' * 10], show_index=False, max_bytes_per_second=300, frame_interval=.1)
+        for index in range(3):
+            lines._defer(index)
+        lines.set_priority(0, 1)
+        lines._print_deferred()
+        printed = print_patch.mock_calls[-1].args[0]
+        self.assertIn('a' * 10, printed)
+        self.assertIn('c' * 10, printed)
+        self.assertNotIn('b' * 10, printed)
+        self.assertEqual(list(lines._deferred), [1])
+
+    @patch('list2term.Lines._validate_data')
+    def test__adapt_budget_Should_AdjustBudget_When_Called(self, *patches):
+        lines = Lines(size=3, max_bytes_per_second=1000, frame_interval=.1)
+        lines._adapt_budget(.09)
+        self.assertEqual(lines._budget, 50)
+        lines._adapt_budget(.001)
+        self.assertEqual(lines._budget, 62.5)
+        for _ in range(10):
+            lines._adapt_budget(.001)
+        self.assertEqual(lines._budget, 100)
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.sys.stderr')
+    @patch('list2term.Lines._tick')
+    def test__start_clock_Should_RunTicks_When_BudgetAndTty(self, tick_patch, stderr_patch, *patches):
+        stderr_patch.isatty.return_value = True
+        lines = Lines(size=3, max_bytes_per_second=1000, frame_interval=.001)
+        lines._start_clock()
+        time.sleep(.05)
+        lines._stop_clock()
+        tick_patch.assert_called()
+        self.assertIsNone(lines._clock)
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.sys.stderr')
+    @patch('builtins.print')
+    def test__set_item_Should_PaintOnlyMovedRows_When_SortKey(self, print_patch, stderr_patch, *patches):
+        stderr_patch.isatty.return_value = True
+        lines = Lines(data=['b', 'c', 'd', 'e'], show_index=False, sort_key=str)
+        lines._print_lines()
+        print_patch.reset_mock()
+        lines[3] = 'a'
+        printed = [c.args[0].split(CLEAR_EOL)[-1] for c in print_patch.mock_calls]
+        self.assertEqual(printed, ['a', 'b', 'c', 'd'])
+        print_patch.reset_mock()
+        lines[1] = 'cc'
+        printed = [c.args[0].split(CLEAR_EOL)[-1] for c in print_patch.mock_calls]
+        self.assertEqual(printed, ['cc'])
+        self.assertEqual(lines._screen, ['a', 'b', 'cc', 'd'])
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.sys.stderr')
+    @patch('builtins.print')
+    def test__pop_Should_ClearRowsNoLongerDisplayed_When_SortKey(self, print_patch, stderr_patch, *patches):
+        stderr_patch.isatty.return_value = True
+        lines = Lines(data=['b', 'a', 'c'], show_index=False, sort_key=str)
+        lines._print_lines()
+        lines.pop(1)
+        self.assertEqual(lines._screen, ['b', 'c'])
+
+    def test__init_Should_RaiseValueError_When_SortKeyAndBudget(self, *patches):
+        with self.assertRaises(ValueError):
+            Lines(size=3, sort_key=str, max_bytes_per_second=100)
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.sys.stderr')
+    @patch('builtins.print')
+    def test__set_item_Should_CollapseLineIntoSummary_When_Collapse(self, print_patch, stderr_patch, *patches):
+        stderr_patch.isatty.return_value = True
+        collapse = lambda value: value if value in ('done', 'failed') else None
+        lines = Lines(data=['a', 'done', 'b', 'c'], show_index=False, collapse=collapse)
+        lines._print_lines()
+        self.assertEqual(lines._screen[:3], ['a', 'b', 'c'])
+        self.assertTrue(lines._screen[3].startswith('done: 1 | active: 3 |'))
+        lines[0] = 'failed'
+        self.assertEqual(lines._screen[:2], ['b', 'c'])
+        self.assertTrue(lines._screen[2].startswith('done: 1 failed: 1 | active: 2 |'))
+        self.assertEqual(len(lines._screen), 3)
+        lines[1] = 'd'
+        self.assertEqual(lines._screen[:3], ['d', 'b', 'c'])
+        self.assertTrue(lines._screen[3].startswith('failed: 1 | active: 3 |'))
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.time.monotonic')
+    def test__stale_Should_ReturnLinesNotUpdated_When_Called(self, monotonic_patch, *patches):
+        monotonic_patch.return_value = 100
+        lines = Lines(size=3, stale_after=10)
+        monotonic_patch.return_value = 105
+        lines[1] = 'updated'
+        monotonic_patch.return_value = 112
+        self.assertEqual(lines.stale(), [(0, 12), (2, 12)])
+        self.assertEqual(lines.stale(threshold=5), [(0, 12), (1, 7), (2, 12)])
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    @patch('list2term.list2term.time.monotonic')
+    def test__stale_Should_ExcludeFinishedLines_When_FinishedSet(self, monotonic_patch, print_line_patch, *patches):
+        on_stale = Mock()
+        monotonic_patch.return_value = 100
+        lines = Lines(size=3, stale_after=10, on_stale=on_stale, finished=lambda value: value == 'done')
+        lines[0] = 'done'
+        monotonic_patch.return_value = 112
+        self.assertEqual(lines.stale(), [(1, 12), (2, 12)])
+        lines._check_stale()
+        on_stale.assert_called_once_with([(1, 12), (2, 12)])
+        self.assertEqual(lines._stale, {1: 12, 2: 12})
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.time.monotonic')
+    def test__stale_Should_ExcludeCollapsedLines_When_CollapseSet(self, monotonic_patch, *patches):
+        monotonic_patch.return_value = 100
+        lines = Lines(data=['complete', 'running'], stale_after=10, collapse=lambda value: value == 'complete' and value)
+        monotonic_patch.return_value = 112
+        self.assertEqual(lines.stale(), [(1, 12)])
+
+    @patch('list2term.Lines._validate_data')
+    def test__stale_Should_RaiseValueError_When_NoThreshold(self, *patches):
+        lines = Lines(size=3)
+        with self.assertRaises(ValueError):
+            lines.stale()
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    @patch('list2term.list2term.time.monotonic')
+    def test__check_stale_Should_PrintChangedAndCallOnStale_When_LinesBecomeStale(self, monotonic_patch, print_line_patch, *patches):
+        on_stale = Mock()
+        monotonic_patch.return_value = 100
+        lines = Lines(size=2, stale_after=10, on_stale=on_stale, use_color=False)
+        monotonic_patch.return_value = 111
+        lines._check_stale()
+        on_stale.assert_called_once_with([(0, 11), (1, 11)])
+        self.assertEqual(len(print_line_patch.mock_calls), 2)
+        self.assertEqual(lines._render(0), '0:  [idle 11s]')
+        lines._check_stale()
+        self.assertEqual(len(print_line_patch.mock_calls), 2)
+        monotonic_patch.return_value = 112
+        lines[0] = 'updated'
+        self.assertEqual(lines._render(0), '0: updated')
+        lines._check_stale()
+        self.assertEqual(len(on_stale.mock_calls), 1)
+        self.assertEqual(lines._stale, {1: 12})
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.sys.stderr')
+    @patch('list2term.Lines._print_line')
+    def test__sync_Should_PrintOnlyChangedLines_When_SameLength(self, print_line_patch, stderr_patch, *patches):
+        stderr_patch.isatty.return_value = True
+        lines = Lines(data=['a', 'b', 'c', 'd'])
+        lines.sync(['a', 'x', 'c', 'd'])
+        self.assertEqual(list(lines), ['a', 'x', 'c', 'd'])
+        print_line_patch.assert_called_once_with(1)
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.sys.stderr')
+    @patch('list2term.Lines._print_line')
+    @patch('builtins.print')
+    def test__sync_Should_InsertAndDeleteTerminalLines_When_NoIndex(self, print_patch, print_line_patch, stderr_patch, *patches):
+        stderr_patch.isatty.return_value = True
+        lines = Lines(data=['a', 'b', 'c', 'd'], show_index=False)
+        lines.sync(['a', 'c', 'd', 'e', 'f'])
+        self.assertEqual(list(lines), ['a', 'c', 'd', 'e', 'f'])
+        printed = ''.join(c.args[0] for c in print_patch.mock_calls)
+        self.assertIn('\033[1M', printed)
+        self.assertIn('\033[2L', printed)
+        self.assertEqual(print_line_patch.mock_calls, [call(3), call(4)])
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.list2term.sys.stderr')
+    @patch('list2term.Lines._print_lines')
+    @patch('list2term.Lines._clear_line')
+    def test__sync_Should_RedrawFromFirstInsertOrDelete_When_ShowIndex(self, clear_line_patch, print_lines_patch, stderr_patch, *patches):
+        stderr_patch.isatty.return_value = True
+        lines = Lines(data=['a', 'b', 'c', 'd'])
+        lines.sync(['a', 'b', 'd'])
+        clear_line_patch.assert_called_once_with(3)
+        print_lines_patch.assert_called_once_with(from_index=2)
+
+    def test__sync_Should_RaiseValueError_When_Lookup(self, *patches):
+        lines = Lines(lookup=['a', 'b'])
+        with self.assertRaises(ValueError):
+            lines.sync(['a'])
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__remove_line_Should_RemoveLookupAndLabel_When_LineIdExists(self, *patches):
+        lines = Lines(lookup=['a', 'b', 'c'], y_axis_labels=['A', 'B', 'C'])
+        lines.remove_line('b')
+        self.assertEqual(lines._lookup, ['a', 'c'])
+        self.assertEqual(lines._lookup_map, {'a': 0, 'c': 1})
+        self.assertEqual(lines._y_axis_labels, ['A', 'C'])
+        self.assertEqual(len(lines), 2)
+        with self.assertRaises(ValueError):
+            lines.remove_line('b')
+
+    def test__index_of_Should_ReturnIndex_When_LineIdExists(self, *patches):
+        lines = Lines(lookup=['a', 'b'])
+        self.assertEqual(lines.index_of('b'), 1)
+        self.assertIsNone(lines.index_of('c'))
+        self.assertIsNone(Lines(size=1).index_of('a'))
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import threading
+import unittest
+from mock import patch
+from list2term import Lines
+from list2term.__main__ import run
+from list2term.__main__ import StreamReader
+from list2term.__main__ import _render
+from list2term.__main__ import get_parser
+
+
+class TestMain(unittest.TestCase):
+
+    def get_lines(self):
+        return Lines(data=[], lookup=[], y_axis_labels=[])
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    @patch('list2term.Lines.print_above')
+    def test__run_Should_CreateAndUpdateLines_When_ReadingPipeAndFile(self, print_above_patch, *patches):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'input.txt')
+            with open(path, 'wb') as stream:
+                stream.write(b'c->from file\n')
+            read_fd, write_fd = os.pipe()
+
+            def produce():
+                with os.fdopen(write_fd, 'wb') as stream:
+                    stream.write(b'a->first\nb->  second\nnot routed\n')
+                    stream.write(b''.join(f'a->{number}\n'.encode() for number in range(10000)))
+                    stream.write(b'b->x->last')
+
+            thread = threading.Thread(target=produce, daemon=True)
+            thread.start()
+            lines = self.get_lines()
+            with patch('list2term.__main__._open', side_effect=[read_fd, os.open(path, os.O_RDONLY)]):
+                run(['pipe', path], lines, interval=.001)
+            thread.join()
+        self.assertEqual(lines[lines.index_of('a')], '9999')
+        self.assertEqual(lines[lines.index_of('b')], 'second')
+        self.assertEqual(lines[lines.index_of('b->x')], 'last')
+        self.assertEqual(lines[lines.index_of('c')], 'from file')
+        self.assertEqual(lines._y_axis_labels, lines._lookup)
+        print_above_patch.assert_called_once_with('not routed')
+
+    def test__get_parser_Should_DefaultToStdin_When_NoSources(self, *patches):
+        args = get_parser().parse_args([])
+        self.assertEqual(args.sources, ['-'])
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    @patch('list2term.Lines.print_above')
+    def test__render_Should_PrintAbove_When_MaxLinesReached(self, print_above_patch, *patches):
+        lines = self.get_lines()
+        pending = {b'a': b'1', b'b': b'2', b'c': b'3'}
+        _render(lines, pending, [], max_lines=2)
+        self.assertEqual(list(lines), ['1', '2'])
+        print_above_patch.assert_called_once_with('c->3')
+        _render(lines, {b'b': b'4'}, [], max_lines=2)
+        self.assertEqual(list(lines), ['1', '4'])
+        self.assertEqual(pending, {})
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    @patch('list2term.__main__._render', side_effect=KeyboardInterrupt)
+    @patch('list2term.__main__.StreamReader.close')
+    def test__run_Should_CloseReaders_When_Interrupted(self, close_patch, *patches):
+        read_fd, write_fd = os.pipe()
+        try:
+            with patch('list2term.__main__._open', return_value=read_fd):
+                with self.assertRaises(KeyboardInterrupt):
+                    run(['-'], self.get_lines(), interval=0)
+            close_patch.assert_called_once_with()
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test__parse_Should_StripCarriageReturn_When_LinesEndWithCrLf(self, *patches):
+        pending = {}
+        above = []
+        StreamReader(0, pending, above)._parse([b'a->first\r', b'not routed\r', b'\r'])
+        self.assertEqual(pending, {b'a': b'first'})
+        self.assertEqual(above, [b'not routed'])
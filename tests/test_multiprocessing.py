@@ -0,0 +1,256 @@
+import time
+import unittest
+from mock import patch
+from mock import call
+from mock import Mock
+from queue import Empty
+from queue import Full
+from list2term import Lines
+from list2term.multiprocessing import BoundedLinesQueue
+from list2term.multiprocessing import AdaptiveConcurrency
+from list2term.multiprocessing import GrowingPool
+from list2term.multiprocessing import CpuTimedTask
+from list2term.multiprocessing import _adaptive_map
+from list2term.multiprocessing import LinesPool
+
+_initialized = None
+
+
+def initialize(value):
+    global _initialized
+    _initialized = value
+
+
+def get_initialized(number, lines_queue):
+    lines_queue.write(f'{number}->initialized')
+    return _initialized
+
+
+def sleep(seconds, lines_queue):
+    time.sleep(seconds)
+
+
+def square(number, lines_queue):
+    lines_queue.write(f'{number}->squared')
+    return number * number
+
+
+class TestBoundedLinesQueue(unittest.TestCase):
+
+    def test__init_Should_RaiseValueError_When_InvalidMaxsize(self, *patches):
+        with self.assertRaises(ValueError):
+            BoundedLinesQueue(0)
+
+    def test__init_Should_RaiseValueError_When_InvalidOverflow(self, *patches):
+        with self.assertRaises(ValueError):
+            BoundedLinesQueue(2, overflow='drop-newest')
+
+    def test__put_Should_RaiseFull_When_BlockPolicyAndTimeout(self, *patches):
+        queue = BoundedLinesQueue(1)
+        queue.write('a->1')
+        with self.assertRaises(Full):
+            queue.write('a->2', timeout=.01)
+        with self.assertRaises(Full):
+            queue.write('a->2', block=False)
+
+    def test__put_Should_DropOldest_When_DropOldestPolicyAndFull(self, *patches):
+        queue = BoundedLinesQueue(2, overflow='drop-oldest')
+        for item in ['a->1', 'b->1', 'c->1']:
+            queue.write(item)
+        self.assertEqual(queue.get(), 'b->1')
+        self.assertEqual(queue.get(), 'c->1')
+        self.assertEqual(queue.stats(), {'dropped': 1, 'merged': 0})
+
+    def test__put_Should_ReplacePendingMessage_When_LatestPolicy(self, *patches):
+        queue = BoundedLinesQueue(2, overflow='latest')
+        for item in ['a->1', 'b->1', 'a->2', 'a->3', 'no id']:
+            queue.write(item)
+        self.assertEqual(queue.qsize(), 2)
+        self.assertEqual(queue.get(), 'b->1')
+        self.assertEqual(queue.get(), 'no id')
+        self.assertEqual(queue.stats(), {'dropped': 1, 'merged': 2})
+
+    def test__put_Should_NotMerge_When_LatestPolicyAndMessageAlreadyRead(self, *patches):
+        queue = BoundedLinesQueue(2, overflow='latest')
+        queue.write('a->1')
+        self.assertEqual(queue.get(), 'a->1')
+        queue.write('a->2')
+        self.assertEqual(queue.get(), 'a->2')
+        self.assertEqual(queue.stats(), {'dropped': 0, 'merged': 0})
+
+    def test__get_Should_RaiseEmpty_When_NoItems(self, *patches):
+        queue = BoundedLinesQueue(2)
+        with self.assertRaises(Empty):
+            queue.get(timeout=.01)
+        with self.assertRaises(Empty):
+            queue.get(block=False)
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+
+    def test__record_Should_IncreaseLimit_When_ThroughputImproves(self, *patches):
+        controller = AdaptiveConcurrency(4, maximum=16, window=2)
+        controller._window_start = 0
+        controller.record(1, now=1)
+        controller.record(1, now=1)
+        self.assertEqual(controller.limit, 5)
+        self.assertEqual(controller.throughput, 2)
+        controller.record(1, now=1.5)
+        controller.record(1, now=1.5)
+        self.assertEqual(controller.limit, 6)
+
+    def test__record_Should_ReverseDirection_When_ThroughputDrops(self, *patches):
+        controller = AdaptiveConcurrency(8, maximum=16, window=1)
+        controller._window_start = 0
+        controller.record(1, now=1)
+        self.assertEqual(controller.limit, 10)
+        controller.record(1, now=3)
+        self.assertEqual(controller.limit, 8)
+
+    def test__record_Should_DecreaseLimit_When_LatencyGrowsWithoutThroughputGain(self, *patches):
+        controller = AdaptiveConcurrency(8, maximum=16, window=1)
+        controller._window_start = 0
+        controller.record(1, now=1)
+        controller.record(2, now=2)
+        self.assertEqual(controller.limit, 8)
+
+    @patch('list2term.multiprocessing.CONCURRENCY', 2)
+    def test__record_Should_DecreaseLimit_When_CpuSaturated(self, *patches):
+        controller = AdaptiveConcurrency(2, window=1)
+        controller._window_start = 0
+        controller.record(1, now=1, cpu=1.9)
+        self.assertEqual(controller.limit, 1)
+        controller.record(1, now=2, cpu=1.9)
+        self.assertEqual(controller.limit, 1)
+
+    @patch('list2term.multiprocessing.CONCURRENCY', 2)
+    def test__record_Should_IncreaseLimit_When_CpuNotSaturated(self, *patches):
+        controller = AdaptiveConcurrency(2, maximum=4, window=1)
+        controller._window_start = 0
+        controller.record(1, now=1, cpu=1)
+        self.assertEqual(controller.limit, 3)
+
+    def test__init_Should_CapLimit_When_InitialGreaterThanMaximum(self, *patches):
+        controller = AdaptiveConcurrency(8, maximum=4)
+        self.assertEqual(controller.limit, 4)
+
+
+class TestGrowingPool(unittest.TestCase):
+
+    @patch('list2term.multiprocessing.Pool')
+    def test__apply_async_Should_StartPools_When_ProcessesBusy(self, pool_patch, *patches):
+        with GrowingPool() as pool:
+            results = [pool.apply_async(print, (), 2) for _ in range(2)]
+            self.assertEqual(pool_patch.mock_calls[0], call(2))
+            self.assertEqual(pool.processes, 2)
+            pool.apply_async(print, (), 5)
+            self.assertEqual(pool.processes, 5)
+            pool.release(results[0])
+            pool.apply_async(print, (), 5)
+            self.assertEqual(pool.processes, 5)
+        self.assertEqual(pool_patch.return_value.terminate.call_count, 2)
+
+    @patch('list2term.multiprocessing.Pool')
+    def test__apply_async_Should_CapPoolSize_When_FewerTasksRemaining(self, pool_patch, *patches):
+        with GrowingPool() as pool:
+            pool.apply_async(print, (), 64, remaining=3)
+            self.assertEqual(pool_patch.mock_calls[0], call(3))
+            self.assertEqual(pool.processes, 3)
+
+
+class TestCpuTimedTask(unittest.TestCase):
+
+    @patch('list2term.multiprocessing.time.process_time', side_effect=[1., 1.5])
+    def test__call_Should_ReturnResultAndCpuSeconds_When_Called(self, *patches):
+        function = Mock(return_value='done')
+        self.assertEqual(CpuTimedTask(function)(1, 2), ('done', .5))
+        function.assert_called_once_with(1, 2)
+
+
+class TestAdaptiveMap(unittest.TestCase):
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__adaptive_map_Should_RemoveSummaryLine_When_YAxisLabelsSet(self, print_line_patch, *patches):
+        lines = Lines(lookup=['a', 'b'], y_axis_labels=['A', 'B'], use_color=False)
+        pool = Mock()
+        pool.apply_async.return_value.ready.return_value = True
+        pool.apply_async.return_value.get.return_value = (1, .1)
+        lines_queue = Mock()
+        lines_queue.get.side_effect = Empty
+        controller = AdaptiveConcurrency(2, maximum=2)
+        result = _adaptive_map(pool, Mock(), [(1,), (2,), (3,)], lines_queue, controller, lines, False)
+        self.assertEqual(result.get(), [1, 1, 1])
+        self.assertEqual(pool.release.call_count, 3)
+        self.assertIn(call(2), print_line_patch.mock_calls)
+        self.assertEqual(list(lines), ['', ''])
+        self.assertEqual(lines._lookup, ['a', 'b'])
+        self.assertEqual(lines._y_axis_labels, ['A', 'B'])
+        self.assertEqual(lines._render(1), 'B: ')
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__adaptive_map_Should_AppendSummaryLine_When_LinesWithoutLookup(self, print_line_patch, *patches):
+        lines = Lines(size=2, use_color=False)
+        pool = Mock()
+        pool.apply_async.return_value.ready.return_value = True
+        pool.apply_async.return_value.get.return_value = (1, .1)
+        lines_queue = Mock()
+        lines_queue.get.side_effect = Empty
+        result = _adaptive_map(pool, Mock(), [(1,)], lines_queue, AdaptiveConcurrency(1), lines, False)
+        self.assertEqual(result.get(), [1])
+        self.assertIn(call(2), print_line_patch.mock_calls)
+        self.assertEqual(list(lines), ['', ''])
+        self.assertIsNone(lines._lookup)
+
+
+class TestLinesPool(unittest.TestCase):
+
+    def test__map_Should_ReusePool_When_CalledTwice(self, *patches):
+        with LinesPool(processes=1, print_status=False, start_method='spawn') as pool:
+            first = pool.map(square, [(1,), (2,)]).get()
+            process_pool = pool._pool
+            second = pool.map(square, [(3,), (4,)]).get()
+            self.assertIs(pool._pool, process_pool)
+        self.assertEqual(first, [1, 4])
+        self.assertEqual(second, [9, 16])
+
+    def test__map_Should_RunInitializer_When_WorkerStarts(self, *patches):
+        with LinesPool(processes=1, print_status=False, initializer=initialize, initargs=('ready',)) as pool:
+            results = pool.map(get_initialized, [(number,) for number in range(4)]).get()
+        self.assertEqual(results, ['ready'] * 4)
+
+    def test__map_Should_RaiseRuntimeError_When_NotEntered(self, *patches):
+        pool = LinesPool(processes=1)
+        with self.assertRaises(RuntimeError):
+            pool.map(square, [(1,)])
+        with pool:
+            pass
+        with self.assertRaises(RuntimeError):
+            pool.map(square, [(1,)])
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__map_Should_WriteMessagesToLines_When_Context(self, *patches):
+        lines = Lines(lookup=['1', '2'])
+        with LinesPool(processes=1, context=lines) as pool:
+            pool.map(square, [(1,), (2,)])
+        self.assertEqual(list(lines), ['squared', 'squared'])
+
+    def test__exit_Should_TerminatePool_When_ExitingWithException(self, *patches):
+        start = time.monotonic()
+        with self.assertRaises(KeyboardInterrupt):
+            with LinesPool(processes=1, print_status=False) as pool:
+                pool._pool.starmap_async(sleep, [(1, None)] * 5)
+                raise KeyboardInterrupt
+        self.assertLess(time.monotonic() - start, 3)
+
+    @patch('list2term.multiprocessing.QueueManager')
+    def test__enter_Should_ShutdownManager_When_ContextEnterFails(self, manager_patch, *patches):
+        context = Mock()
+        context.__enter__ = Mock(side_effect=OSError)
+        pool = LinesPool(processes=1, context=context)
+        with self.assertRaises(OSError):
+            pool.__enter__()
+        manager_patch.return_value.shutdown.assert_called_once_with()
+        self.assertIsNone(pool._pool)
@@ -0,0 +1,92 @@
+import os
+import time
+import socket
+import tempfile
+import unittest
+from mock import patch
+from mock import Mock
+from list2term import Lines
+from list2term.server import LinesServer
+from list2term.server import LinesClient
+
+
+class TestLinesServer(unittest.TestCase):
+
+    def wait_for(self, predicate, timeout=2):
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            if predicate():
+                return True
+            time.sleep(.01)
+        return False
+
+    def test__apply_Should_WriteText_When_PlainMessage(self, *patches):
+        lines = Mock()
+        LinesServer.apply(lines, 'a->hello')
+        lines.write.assert_called_once_with('a->hello')
+
+    def test__apply_Should_SetIndex_When_JsonIndexMessage(self, *patches):
+        lines = Lines(size=3)
+        LinesServer.apply(lines, '{"index": 1, "message": "hello"}')
+        self.assertEqual(lines[1], 'hello')
+
+    def test__apply_Should_IgnoreUpdate_When_JsonIndexOutOfRange(self, *patches):
+        lines = Lines(size=3)
+        LinesServer.apply(lines, '{"index": 5, "message": "hello"}')
+        self.assertEqual(list(lines), ['', '', ''])
+
+    def test__apply_Should_WriteLineId_When_JsonLineIdMessage(self, *patches):
+        lines = Mock()
+        LinesServer.apply(lines, '{"line_id": "a", "message": "hello"}')
+        lines.write.assert_called_once_with('hello', line_id='a')
+
+    def test__apply_Should_WriteText_When_InvalidJson(self, *patches):
+        lines = Mock()
+        LinesServer.apply(lines, '{not json')
+        lines.write.assert_called_once_with('{not json')
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    def test__server_Should_UpdateLines_When_ClientWrites(self, *patches):
+        with tempfile.TemporaryDirectory() as directory:
+            address = os.path.join(directory, 'lines.sock')
+            lines = Lines(lookup=['a', 'b', 'c'])
+            with LinesServer(lines, address):
+                with LinesClient(address, batch_size=2) as client:
+                    client.write('a->first')
+                    client.write('second', line_id='b')
+                    client[2] = 'third'
+                self.assertTrue(self.wait_for(lambda: lines[2] == 'third'))
+            self.assertEqual(list(lines), ['first', 'second', 'third'])
+            self.assertFalse(os.path.exists(address))
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    def test__start_Should_RaiseFileExistsError_When_AddressIsRegularFile(self, *patches):
+        with tempfile.TemporaryDirectory() as directory:
+            address = os.path.join(directory, 'lines.sock')
+            with open(address, 'w') as stream:
+                stream.write('keep')
+            with self.assertRaises(FileExistsError):
+                LinesServer(Lines(size=1), address).start()
+            with open(address) as stream:
+                self.assertEqual(stream.read(), 'keep')
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    def test__start_Should_RemoveStaleSocket_When_AddressIsSocket(self, *patches):
+        with tempfile.TemporaryDirectory() as directory:
+            address = os.path.join(directory, 'lines.sock')
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(address)
+            stale.close()
+            server = LinesServer(Lines(size=1), address)
+            server.start()
+            server.stop()
+            self.assertFalse(os.path.exists(address))
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    def test__client_Should_FlushAfterInterval_When_BatchNotFull(self, *patches):
+        lines = Lines(lookup=['a', 'b'])
+        with LinesServer(lines, ('127.0.0.1', 0)) as server:
+            client = LinesClient(server.address, batch_size=100, flush_interval=.01)
+            client.write('b->hello')
+            self.assertTrue(self.wait_for(lambda: lines[1] == 'hello'))
+            client.close()
@@ -0,0 +1,130 @@
+import threading
+import unittest
+from mock import patch
+from list2term import Lines
+from list2term.shards import ShardedUpdates
+
+
+class TestShardedUpdates(unittest.TestCase):
+
+    def test__init_Should_RaiseValueError_When_CountInvalid(self, *patches):
+        with self.assertRaises(ValueError):
+            ShardedUpdates(0)
+
+    def test__put_Should_KeepLatestItem_When_IndexUpdated(self, *patches):
+        shards = ShardedUpdates(4)
+        shards.put(1, 'a')
+        shards.put(1, 'b')
+        shards.put(6, 'c')
+        self.assertEqual(len(shards), 2)
+        self.assertEqual(shards.get(1), 'b')
+        self.assertEqual(shards.get(2, 'x'), 'x')
+
+    def test__take_Should_ReturnAndResetPending_When_Called(self, *patches):
+        shards = ShardedUpdates(3)
+        shards.put(0, 'a')
+        shards.put(5, 'b')
+        self.assertEqual(shards.take(), {0: 'a', 5: 'b'})
+        self.assertEqual(shards.take(), {})
+        self.assertEqual(len(shards), 0)
+
+    def test__put_Should_NotLoseItems_When_ThreadsUpdateConcurrently(self, *patches):
+        shards = ShardedUpdates(8)
+        taken = {}
+        stop = threading.Event()
+
+        def update(index):
+            for count in range(2000):
+                shards.put(index, count)
+
+        def render():
+            while not stop.is_set():
+                taken.update(shards.take())
+
+        owner = threading.Thread(target=render)
+        owner.start()
+        writers = [threading.Thread(target=update, args=(index,)) for index in range(16)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        stop.set()
+        owner.join()
+        taken.update(shards.take())
+        self.assertEqual(taken, {index: 1999 for index in range(16)})
+
+
+class TestLinesShards(unittest.TestCase):
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__setitem_Should_StoreInShards_When_Active(self, print_line_patch, *patches):
+        lines = Lines(size=3, shards=2)
+        lines._active = True
+        lines[1] = 'a'
+        lines[-1] = 'b'
+        print_line_patch.assert_not_called()
+        self.assertEqual(lines.data, ['', '', ''])
+        self.assertEqual((lines[1], lines[2], lines[0]), ('a', 'b', ''))
+        lines._tick()
+        self.assertEqual(lines.data, ['', 'a', 'b'])
+        self.assertEqual(len(print_line_patch.mock_calls), 2)
+        self.assertEqual(len(lines._shards), 0)
+
+    @patch('list2term.Lines._validate_data')
+    def test__setitem_Should_RaiseIndexError_When_IndexOutOfRange(self, *patches):
+        lines = Lines(size=3, shards=2)
+        lines._active = True
+        with self.assertRaises(IndexError):
+            lines[3] = 'a'
+        with self.assertRaises(IndexError):
+            lines[-4] = 'a'
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__setitem_Should_SetItem_When_NotActive(self, print_line_patch, *patches):
+        lines = Lines(size=2, shards=2)
+        lines[0] = 'a'
+        self.assertEqual(lines.data, ['a', ''])
+        print_line_patch.assert_called_once_with(0)
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__write_Should_StoreInShards_When_Active(self, *patches):
+        lines = Lines(lookup=['a', 'b'], shards=2)
+        lines._active = True
+        lines.write('b->working')
+        self.assertEqual(lines[1], 'working')
+        self.assertEqual(lines.data, ['', ''])
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__delitem_Should_ApplyShardsFirst_When_Pending(self, *patches):
+        lines = Lines(data=['a', 'b', 'c'], shards=2)
+        lines._active = True
+        lines[2] = 'x'
+        del lines[0]
+        self.assertEqual(lines.data, ['b', 'x'])
+
+    @patch('list2term.Lines._validate_data')
+    @patch('list2term.Lines._print_line')
+    def test__sync_Should_ApplyShardsBeforeDiff_When_Pending(self, print_line_patch, *patches):
+        lines = Lines(data=['a', 'b', 'c'], shards=2)
+        lines._isatty = True
+        lines._active = True
+        screen = list(lines.data)
+        print_line_patch.side_effect = lambda index: screen.__setitem__(index, lines.data[index])
+        lines[1] = 'X'
+        lines.sync(['a', 'b', 'c'])
+        self.assertEqual(list(lines.data), ['a', 'b', 'c'])
+        self.assertEqual(screen, ['a', 'b', 'c'])
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    def test__exit_Should_ApplyShards_When_ThreadsUpdate(self, *patches):
+        with Lines(size=8, shards=4, frame_interval=60) as lines:
+            threads = [threading.Thread(target=lines.__setitem__, args=(index, f'done {index}')) for index in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(lines.data, [f'done {index}' for index in range(8)])
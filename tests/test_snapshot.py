@@ -0,0 +1,109 @@
+import os
+import struct
+import tempfile
+import unittest
+from mock import patch
+from list2term import Lines
+from list2term.snapshot import SnapshotWriter
+from list2term.snapshot import read_snapshot
+from list2term.snapshot import GENERATION_OFFSET
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'lines.snap')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test__init_Should_RaiseValueError_When_RowsInvalid(self, *patches):
+        with self.assertRaises(ValueError):
+            SnapshotWriter(self.path, 0)
+
+    def test__init_Should_RaiseValueError_When_WidthInvalid(self, *patches):
+        with self.assertRaises(ValueError):
+            SnapshotWriter(self.path, 1, width=2)
+
+    def test__read_snapshot_Should_ReturnRows_When_Written(self, *patches):
+        with SnapshotWriter(self.path, 3, width=16) as writer:
+            writer.begin()
+            writer.set_count(2)
+            writer.write_row(0, 'hello')
+            writer.write_row(1, 'a much longer row than fits')
+            writer.write_row(5, 'ignored')
+            writer.end()
+            generation, rows = read_snapshot(self.path)
+        self.assertEqual(generation, 2)
+        self.assertEqual(rows, ['hello', 'a much longer '])
+
+    def test__read_snapshot_Should_LimitCount_When_CountExceedsRows(self, *patches):
+        with SnapshotWriter(self.path, 2) as writer:
+            writer.begin()
+            writer.set_count(10)
+            writer.end()
+            _, rows = read_snapshot(self.path)
+        self.assertEqual(rows, ['', ''])
+
+    @patch('list2term.snapshot.time.sleep')
+    def test__read_snapshot_Should_RaiseRuntimeError_When_WriterNeverEnds(self, *patches):
+        with SnapshotWriter(self.path, 1) as writer:
+            writer.begin()
+            with self.assertRaises(RuntimeError):
+                read_snapshot(self.path)
+
+    def test__read_snapshot_Should_RaiseValueError_When_NotSnapshot(self, *patches):
+        with open(self.path, 'wb') as stream:
+            stream.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            read_snapshot(self.path)
+
+    def test__begin_Should_SetOddGeneration_When_Called(self, *patches):
+        with SnapshotWriter(self.path, 1) as writer:
+            writer.begin()
+            with open(self.path, 'rb') as stream:
+                self.assertEqual(struct.unpack_from('<Q', stream.read(), GENERATION_OFFSET)[0], 1)
+            writer.end()
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    def test__publish_snapshot_Should_WriteChangedLines_When_Called(self, *patches):
+        writer = SnapshotWriter(self.path, 3)
+        lines = Lines(data=['a', 'b'], snapshot=writer)
+        lines._publish_snapshot()
+        self.assertEqual(read_snapshot(self.path), (2, ['0: a', '1: b']))
+        lines._publish_snapshot()
+        self.assertEqual(read_snapshot(self.path)[0], 2)
+        lines[1] = 'c'
+        with patch.object(writer, 'write_row', wraps=writer.write_row) as write_row_patch:
+            lines._publish_snapshot()
+        write_row_patch.assert_called_once_with(1, '1: c')
+        lines.append('d')
+        lines.append('e')
+        lines._publish_snapshot()
+        self.assertEqual(read_snapshot(self.path)[1], ['0: a', '1: c', '2: d'])
+        writer.close()
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    @patch('list2term.Lines._get_summary', return_value='summary')
+    def test__publish_snapshot_Should_WriteViewRows_When_ViewSet(self, *patches):
+        writer = SnapshotWriter(self.path, 4)
+        collapse = lambda value: value if value == 'done' else None
+        lines = Lines(data=['c', 'done', 'a'], show_index=False, sort_key=str, collapse=collapse, snapshot=writer)
+        lines._publish_snapshot()
+        self.assertEqual(read_snapshot(self.path)[1], ['a', 'c', 'summary'])
+        lines[0] = 'b'
+        lines._publish_snapshot()
+        self.assertEqual(read_snapshot(self.path)[1], ['a', 'b', 'summary'])
+        lines[2] = 'done'
+        lines._publish_snapshot()
+        self.assertEqual(read_snapshot(self.path)[1], ['b', 'summary'])
+        writer.close()
+
+    @patch('list2term.list2term.sys.stderr.isatty', return_value=False)
+    def test__exit_Should_PublishAndCloseSnapshot_When_SnapshotSet(self, *patches):
+        with Lines(lookup=['x', 'y'], snapshot=SnapshotWriter(self.path, 2)) as lines:
+            self.assertTrue(lines._clock.is_alive())
+            lines[0] = 'done'
+        self.assertEqual(read_snapshot(self.path)[1], ['0: done', '1: '])
+        self.assertIsNone(lines._snapshot._map)
@@ -0,0 +1,46 @@
+import time
+import threading
+import unittest
+from list2term import Lines
+from list2term.threading import thread_map
+from list2term.threading import report
+
+
+class TestThreadMap(unittest.TestCase):
+
+    def test__thread_map_Should_YieldAllResultsAndReportToBoundLines_When_Called(self, *patches):
+        threads = {}
+
+        def work(number):
+            report(f'processing {number}')
+            threads.setdefault(threading.current_thread().name, set()).add(number)
+            time.sleep(.001)
+            return number * 2
+
+        lines = Lines(size=4)
+        results = list(thread_map(work, range(50), max_workers=4, lines=lines))
+        self.assertEqual(sorted(results), [number * 2 for number in range(50)])
+        self.assertLessEqual(len(threads), 4)
+        self.assertTrue(all(line.startswith('processing') for line in lines[:len(threads)]))
+
+    def test__thread_map_Should_CreateLines_When_NoLines(self, *patches):
+        results = list(thread_map(lambda number: number, range(5), max_workers=2))
+        self.assertEqual(sorted(results), list(range(5)))
+
+    def test__thread_map_Should_RaiseValueError_When_LinesLessThanMaxWorkers(self, *patches):
+        with self.assertRaises(ValueError):
+            list(thread_map(str, range(5), max_workers=3, lines=Lines(size=2)))
+
+    def test__thread_map_Should_RaiseException_When_FunctionRaises(self, *patches):
+
+        def work(number):
+            if number == 3:
+                raise KeyError(number)
+            return number
+
+        with self.assertRaises(KeyError):
+            list(thread_map(work, range(10), max_workers=2, lines=Lines(size=2)))
+
+    def test__report_Should_RaiseRuntimeError_When_NotWorkerThread(self, *patches):
+        with self.assertRaises(RuntimeError):
+            report('hello')
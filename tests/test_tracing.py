@@ -0,0 +1,81 @@
+import unittest
+from mock import patch
+from mock import Mock
+from list2term.tracing import Histogram
+from list2term.tracing import LatencyTracer
+from list2term.tracing import TracedWriter
+from list2term.tracing import TimedTask
+from list2term.tracing import TRACE
+from list2term.tracing import TASK
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test__summary_Should_ReturnPercentiles_When_Values(self, *patches):
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.add(value)
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 100)
+        self.assertEqual(summary['p50'], 51)
+        self.assertEqual(summary['p95'], 95)
+        self.assertEqual(summary['p99'], 99)
+        self.assertEqual(summary['max'], 100)
+
+    def test__summary_Should_ReturnZeros_When_NoValues(self, *patches):
+        summary = Histogram().summary()
+        self.assertEqual(summary, {'count': 0, 'p50': 0., 'p95': 0., 'p99': 0., 'max': 0.})
+
+    def test__add_Should_KeepReservoirSize_When_MoreValuesThanSize(self, *patches):
+        histogram = Histogram(size=10)
+        for value in range(1000):
+            histogram.add(value)
+        self.assertEqual(len(histogram._samples), 10)
+        self.assertEqual(histogram.count, 1000)
+        self.assertEqual(histogram.maximum, 999)
+
+
+class TestLatencyTracer(unittest.TestCase):
+
+    @patch('list2term.tracing.time.time')
+    def test__handle_Should_WriteMessageAndRecordLatency_When_Traced(self, time_patch, *patches):
+        time_patch.side_effect = [10.5, 10.75]
+        tracer = LatencyTracer()
+        write = Mock()
+        tracer.handle((TRACE, 123, 10., 'a->hello'), write)
+        write.assert_called_once_with('a->hello')
+        self.assertEqual(tracer.transport[123].summary()['p50'], .5)
+        self.assertEqual(tracer.render[123].summary()['p50'], .25)
+        self.assertEqual(tracer.total[123].summary()['p50'], .75)
+
+    def test__handle_Should_RecordTaskDuration_When_TaskRecord(self, *patches):
+        tracer = LatencyTracer()
+        write = Mock()
+        tracer.handle((TASK, 123, 10., 12.), write)
+        write.assert_not_called()
+        self.assertEqual(tracer.tasks[123].summary()['max'], 2.)
+
+    def test__handle_Should_WriteItem_When_NotTraced(self, *patches):
+        tracer = LatencyTracer()
+        write = Mock()
+        tracer.handle('a->hello', write)
+        write.assert_called_once_with('a->hello')
+
+    def test__report_Should_ReturnTable_When_Called(self, *patches):
+        tracer = LatencyTracer()
+        tracer.handle((TASK, 123, 10., 12.), Mock())
+        report = tracer.report().split('\n')
+        self.assertEqual(len(report), 2)
+        self.assertTrue(report[1].startswith('tasks'))
+
+
+class TestTimedTask(unittest.TestCase):
+
+    def test__call_Should_ReportTaskDuration_When_Called(self, *patches):
+        queue = Mock()
+        writer = TracedWriter(queue)
+        result = TimedTask(lambda number, logger: logger.write(f'a->{number}') or number)(3, writer)
+        self.assertEqual(result, 3)
+        self.assertEqual(queue.write.mock_calls[0].args[0][0], TRACE)
+        self.assertEqual(queue.write.mock_calls[0].args[0][3], 'a->3')
+        self.assertEqual(queue.write.mock_calls[1].args[0][0], TASK)
@@ -0,0 +1,31 @@
+import unittest
+from list2term.view import SortedView
+
+
+class TestSortedView(unittest.TestCase):
+
+    def test__rebuild_Should_OrderIndicesByKeyThenIndex_When_Called(self, *patches):
+        view = SortedView(len)
+        view.rebuild(['ccc', 'a', 'bb', 'z'])
+        self.assertEqual(view.indices(), [1, 3, 2, 0])
+        self.assertEqual(len(view), 4)
+
+    def test__update_Should_MoveIndexAndReturnPositions_When_KeyChanges(self, *patches):
+        view = SortedView(len)
+        view.rebuild(['ccc', 'a', 'bb', 'z'])
+        self.assertEqual(view.update(0, ''), (3, 0))
+        self.assertEqual(view.indices(), [0, 1, 3, 2])
+        self.assertEqual(view.index_at(3), 2)
+
+    def test__update_Should_ReturnSamePosition_When_KeyUnchanged(self, *patches):
+        view = SortedView(len)
+        view.rebuild(['ccc', 'a', 'bb', 'z'])
+        self.assertEqual(view.update(2, 'xx'), (2, 2))
+
+    def test__update_Should_ReturnNonePosition_When_NotVisible(self, *patches):
+        view = SortedView(visible=lambda value: value != 'done')
+        view.rebuild(['a', 'done', 'b'])
+        self.assertEqual(view.indices(), [0, 2])
+        self.assertEqual(view.update(0, 'done'), (0, None))
+        self.assertEqual(view.update(1, 'c'), (None, 0))
+        self.assertEqual(view.indices(), [1, 2])